@@ -3,8 +3,11 @@ from __future__ import annotations
 
 import os
 import json
+import statistics
 import time
+from contextlib import suppress
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional
 
@@ -57,6 +60,8 @@ st.set_page_config(
 # Initialize session state
 if 'audit_history' not in st.session_state:
     st.session_state.audit_history = []
+if 'audit_scores' not in st.session_state:
+    st.session_state.audit_scores = []
 if 'current_result' not in st.session_state:
     st.session_state.current_result = None
 if 'dark_mode' not in st.session_state:
@@ -67,33 +72,98 @@ if 'selected_audits' not in st.session_state:
     st.session_state.selected_audits = set()
 if 'selected_audit_id' not in st.session_state:
     st.session_state.selected_audit_id = None
+if 'pending_delete_id' not in st.session_state:
+    st.session_state.pending_delete_id = None
+if 'export_target_id' not in st.session_state:
+    st.session_state.export_target_id = None
 if 'last_runtime' not in st.session_state:
     st.session_state.last_runtime = None
 if 'last_llm_enabled' not in st.session_state:
     st.session_state.last_llm_enabled = False
 
+# Seconds before a cached report-exists check on a history row is re-stat'ed
+REPORT_STAT_TTL = 30.0
+
+@lru_cache(maxsize=4096)
+def _format_iso(timestamp: str) -> str:
+    """Format an ISO timestamp for display, falling back to the raw value"""
+    with suppress(TypeError, ValueError):
+        return datetime.fromisoformat(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+    return timestamp
+
 class AuditHistoryManager:
     """Manage audit history and persistence"""
     
     def __init__(self, history_file: Path = Path("data/audit_history.json")):
         self.history_file = history_file
         self.history_file.parent.mkdir(parents=True, exist_ok=True)
-        self.load_history()
+        if not st.session_state.get('audit_history_loaded'):
+            self.load_history()
     
     def load_history(self):
         """Load audit history from file"""
+        history = st.session_state.get('audit_history', [])
         try:
             if self.history_file.exists():
                 with open(self.history_file, 'r') as f:
-                    st.session_state.audit_history = json.load(f)
+                    history = json.load(f)
+            if not isinstance(history, list):
+                history = []
+            history = [audit for audit in history if isinstance(audit, dict)]
+            # Keep newest-first order regardless of how the file was written
+            history.sort(key=lambda audit: str(audit.get('timestamp') or ''), reverse=True)
+            for audit in history:
+                self._derive_fields(audit)
         except Exception:
-            st.session_state.audit_history = []
+            history = []
+        st.session_state.audit_history = history
+        st.session_state.audit_history_loaded = True
+        self._sync_scores()
+        self._bump_version()
+
+    @staticmethod
+    def _derive_fields(audit: Dict):
+        """Attach display-only fields (prefixed with '_') computed once per audit"""
+        audit['_formatted_time'] = _format_iso(audit.get('timestamp') or '')
+        markdown_path = Path(audit.get('output_dir') or 'outputs') / "audit_report.md"
+        audit['_markdown_path'] = markdown_path
+        audit['_markdown_exists'] = markdown_path.exists()
+        audit['_markdown_checked'] = time.monotonic()
+
+    @staticmethod
+    def report_available(audit: Dict) -> bool:
+        """Whether the audit's markdown report exists, re-checking at most every REPORT_STAT_TTL seconds"""
+        if '_markdown_path' not in audit:
+            AuditHistoryManager._derive_fields(audit)
+        elif time.monotonic() - audit['_markdown_checked'] > REPORT_STAT_TTL:
+            audit['_markdown_exists'] = audit['_markdown_path'].exists()
+            audit['_markdown_checked'] = time.monotonic()
+        return audit['_markdown_exists']
+
+    @staticmethod
+    def _bump_version():
+        """Mark the in-memory history as changed so derived caches rebuild.
+
+        Uses a monotonic nanosecond stamp rather than a counter because
+        ``st.cache_data`` is shared across sessions in the same process.
+        """
+        st.session_state.audit_history_version = time.monotonic_ns()
+
+    def _sync_scores(self):
+        """Rebuild the flat fairness-score list used for sidebar stats"""
+        st.session_state.audit_scores = [
+            float(audit.get('fairness_score', 0)) for audit in st.session_state.audit_history
+        ]
     
     def save_history(self):
         """Save audit history to file"""
         try:
+            persisted = [
+                {key: value for key, value in audit.items() if not key.startswith('_')}
+                for audit in st.session_state.audit_history
+            ]
             with open(self.history_file, 'w') as f:
-                json.dump(st.session_state.audit_history, f, indent=2)
+                json.dump(persisted, f, indent=2)
         except Exception as e:
             st.error(f"Failed to save history: {e}")
     
@@ -111,7 +181,10 @@ class AuditHistoryManager:
             'output_dir': result_data.get('output_dir', ''),
             'runtime': result_data.get('runtime', 0)
         }
+        self._derive_fields(audit_entry)
         st.session_state.audit_history.insert(0, audit_entry)
+        st.session_state.setdefault('audit_scores', []).insert(0, float(audit_entry['fairness_score']))
+        self._bump_version()
         self.save_history()
     
     def get_audit_by_id(self, audit_id: int) -> Optional[Dict]:
@@ -127,6 +200,8 @@ class AuditHistoryManager:
             audit for audit in st.session_state.audit_history 
             if audit['id'] not in audit_ids
         ]
+        self._sync_scores()
+        self._bump_version()
         self.save_history()
         st.session_state.selected_audits = set()
 
@@ -206,8 +281,9 @@ def create_violations_bar_chart(violations_data: Dict[str, int]) -> go.Figure:
     
     return fig
 
-def create_score_gauge(score: float, title: str) -> go.Figure:
-    """Create a gauge chart for individual scores"""
+@st.cache_data(max_entries=256, show_spinner=False)
+def _score_gauge_spec(score: float, title: str) -> dict:
+    """Build the gauge figure as a plain dict so it can be cached across reruns"""
     fig = go.Figure(go.Indicator(
         mode = "gauge+number+delta",
         value = score,
@@ -239,7 +315,64 @@ def create_score_gauge(score: float, title: str) -> go.Figure:
         paper_bgcolor='white',
         font=dict(color='black', size=12)
     )
-    return fig
+    return fig.to_dict()
+
+def create_score_gauge(score: float, title: str) -> go.Figure:
+    """Create a gauge chart for individual scores"""
+    return go.Figure(_score_gauge_spec(round(float(score), 2), title))
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _score_trend_spec(version: tuple, _history: List[Dict]) -> dict:
+    """Build the historical trend chart; ``version`` is the cache key, ``_history`` is not hashed"""
+    history_df = pd.DataFrame(
+        [
+            (
+                audit.get('timestamp'),
+                audit.get('fairness_score'),
+                audit.get('accessibility_score'),
+                audit.get('ethical_ux_score'),
+            )
+            for audit in _history
+        ],
+        columns=['timestamp', 'fairness_score', 'accessibility_score', 'ethical_ux_score'],
+    )
+    fig_trend = px.line(
+        history_df, 
+        x='timestamp', 
+        y=['fairness_score', 'accessibility_score', 'ethical_ux_score'],
+        title='Score Trends Over Time'
+    )
+    fig_trend.update_layout(
+        paper_bgcolor='white',
+        plot_bgcolor='white',
+        font=dict(color='black', size=12),
+        xaxis=dict(
+            tickfont=dict(color='black', size=10),
+            title_font=dict(color='black', size=12),
+            color='black'
+        ),
+        yaxis=dict(
+            tickfont=dict(color='black', size=10),
+            title_font=dict(color='black', size=12),
+            color='black'
+        ),
+        title_font=dict(color='black', size=14)
+    )
+    fig_trend.update_traces(line=dict(width=3))
+    fig_trend.update_layout(
+        legend=dict(
+            font=dict(color='black', size=10),
+            bgcolor='rgba(255,255,255,0.8)',
+            bordercolor='black',
+            borderwidth=1
+        )
+    )
+    return fig_trend.to_dict()
+
+def create_score_trend(history: List[Dict], limit: int = 10) -> go.Figure:
+    """Create a line chart of score trends for the most recent ``limit`` audits"""
+    version = st.session_state.get('audit_history_version', 0)
+    return go.Figure(_score_trend_spec((version, limit), history[:limit]))
 
 def _try_save_plotly(fig, path):
     try:
@@ -258,6 +391,49 @@ def _try_save_plotly(fig, path):
         except Exception:
             return False
 
+def _stringify_cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list, tuple, set)):
+        try:
+            return json.dumps(value, indent=2, ensure_ascii=False)
+        except Exception:
+            return str(value)
+    return str(value)
+
+@st.cache_data(max_entries=512, show_spinner=False)
+def build_records_table_html(records: List[Dict]) -> str:
+    """Render violation records as a styled HTML table (empty string if none)"""
+    if not records:
+        return ""
+
+    df = pd.DataFrame(records)
+    if df.empty:
+        return ""
+
+    df = df.applymap(_stringify_cell)
+    table_html = df.to_html(index=False, escape=False)
+    return f"""
+    <style>
+        .audit-table table {{
+            width: 100%;
+            border-collapse: collapse;
+        }}
+        .audit-table th,
+        .audit-table td {{
+            text-align: left;
+            border: 1px solid rgba(102, 126, 234, 0.2);
+            padding: 0.45rem 0.6rem;
+            white-space: normal;
+            word-break: break-word;
+        }}
+        .audit-table thead tr {{
+            background: rgba(102, 126, 234, 0.08);
+        }}
+    </style>
+    <div class="audit-table">{table_html}</div>
+    """
+
 def render_audit_results(result, *, runtime: Optional[float] = None, llm_enabled: bool = False):
     """Render audit outcome, visualizations, and download actions."""
     runtime_value = runtime if runtime is not None else st.session_state.get('last_runtime')
@@ -266,46 +442,10 @@ def render_audit_results(result, *, runtime: Optional[float] = None, llm_enabled
 
     llm_analysis = getattr(result, "artifacts", {}).get("llm_analysis") if getattr(result, "artifacts", None) else None
 
-    def _stringify_cell(value):
-        if value is None:
-            return ""
-        if isinstance(value, (dict, list, tuple, set)):
-            try:
-                return json.dumps(value, indent=2, ensure_ascii=False)
-            except Exception:
-                return str(value)
-        return str(value)
-
     def _render_records(records):
-        if not records:
-            return False
-
-        df = pd.DataFrame(records)
-        if df.empty:
+        styled_html = build_records_table_html(records)
+        if not styled_html:
             return False
-
-        df = df.applymap(_stringify_cell)
-        table_html = df.to_html(index=False, escape=False)
-        styled_html = f"""
-        <style>
-            .audit-table table {{
-                width: 100%;
-                border-collapse: collapse;
-            }}
-            .audit-table th,
-            .audit-table td {{
-                text-align: left;
-                border: 1px solid rgba(102, 126, 234, 0.2);
-                padding: 0.45rem 0.6rem;
-                white-space: normal;
-                word-break: break-word;
-            }}
-            .audit-table thead tr {{
-                background: rgba(102, 126, 234, 0.08);
-            }}
-        </style>
-        <div class="audit-table">{table_html}</div>
-        """
         st.markdown(styled_html, unsafe_allow_html=True)
         return True
 
@@ -382,7 +522,7 @@ def render_audit_results(result, *, runtime: Optional[float] = None, llm_enabled
     with col1:
         with st.expander("🎯 Accessibility Details", expanded=True):
             if result.accessibility and getattr(result.accessibility, 'violations', None):
-                records = [violation.__dict__ for violation in result.accessibility.violations]
+                records = [violation.to_dict() for violation in result.accessibility.violations]
                 _render_records(records)
             else:
                 st.success("✅ No accessibility violations found!")
@@ -811,7 +951,7 @@ with st.sidebar:
         st.markdown("---")
         st.markdown("### 📈 Quick Stats")
         total_audits = len(st.session_state.audit_history)
-        avg_score = sum(h['fairness_score'] for h in st.session_state.audit_history) / total_audits
+        avg_score = statistics.fmean(st.session_state.audit_scores) if st.session_state.audit_scores else 0.0
         st.metric("Total Audits", total_audits)
         st.metric("Average Score", f"{avg_score:.2f}")
 
@@ -1175,38 +1315,7 @@ elif st.session_state.current_page == "Reports":
             if len(st.session_state.audit_history) > 1:
                 st.markdown("### 📈 Historical Trends")
                 
-                history_df = pd.DataFrame(st.session_state.audit_history[:10])
-                fig_trend = px.line(
-                    history_df, 
-                    x='timestamp', 
-                    y=['fairness_score', 'accessibility_score', 'ethical_ux_score'],
-                    title='Score Trends Over Time'
-                )
-                fig_trend.update_layout(
-                    paper_bgcolor='white',
-                    plot_bgcolor='white',
-                    font=dict(color='black', size=12),
-                    xaxis=dict(
-                        tickfont=dict(color='black', size=10),
-                        title_font=dict(color='black', size=12),
-                        color='black'
-                    ),
-                    yaxis=dict(
-                        tickfont=dict(color='black', size=10),
-                        title_font=dict(color='black', size=12),
-                        color='black'
-                    ),
-                    title_font=dict(color='black', size=14)
-                )
-                fig_trend.update_traces(line=dict(width=3))
-                fig_trend.update_layout(
-                    legend=dict(
-                        font=dict(color='black', size=10),
-                        bgcolor='rgba(255,255,255,0.8)',
-                        bordercolor='black',
-                        borderwidth=1
-                    )
-                )
+                fig_trend = create_score_trend(st.session_state.audit_history)
                 st.plotly_chart(fig_trend, use_container_width=True)
 
 elif st.session_state.current_page == "History":
@@ -1230,9 +1339,35 @@ elif st.session_state.current_page == "History":
             h for h in st.session_state.audit_history 
             if not search_term or search_term.lower() in h.get('input_value', '').lower()
         ]
-        
+
+        # Only materialize the rows in the current window; reset it when the query changes
+        window_key = (search_term, items_per_page)
+        if st.session_state.get('history_window_key') != window_key:
+            st.session_state.history_window_key = window_key
+            st.session_state.history_window_start = 0
+        last_start = max(0, (len(filtered_history) - 1) // items_per_page * items_per_page)
+        window_start = min(st.session_state.get('history_window_start', 0), last_start)
+        st.session_state.history_window_start = window_start
+        history_window = filtered_history[window_start:window_start + items_per_page]
+
+        if len(filtered_history) > items_per_page:
+            nav_prev, nav_info, nav_next = st.columns([1, 3, 1])
+            with nav_prev:
+                if st.button("⬅️ Newer", disabled=window_start == 0, use_container_width=True):
+                    st.session_state.history_window_start = max(0, window_start - items_per_page)
+                    st.rerun()
+            with nav_info:
+                st.caption(
+                    f"Showing {window_start + 1}–{window_start + len(history_window)} "
+                    f"of {len(filtered_history)} audits"
+                )
+            with nav_next:
+                if st.button("Older ➡️", disabled=window_start >= last_start, use_container_width=True):
+                    st.session_state.history_window_start = window_start + items_per_page
+                    st.rerun()
+
         # Display history with improved styling
-        for audit in filtered_history[:items_per_page]:
+        for audit in history_window:
             with st.container():
                 # st.markdown('<div class="history-item">', unsafe_allow_html=True)
                 col1, col2, col3, col4, col5, col6 = st.columns([1, 3, 1, 1, 1, 1])
@@ -1240,28 +1375,24 @@ elif st.session_state.current_page == "History":
                 with col1:
                     # Small delete button with only dustbin symbol
                     if st.button("🗑️", key=f"delete_{audit['id']}", use_container_width=False):
-                        if st.session_state.get(f"confirm_delete_{audit['id']}", False):
+                        if st.session_state.pending_delete_id == audit['id']:
                             # Second click - actually delete
                             history_manager.delete_audits([audit['id']])
+                            st.session_state.pending_delete_id = None
                             st.success(f"✅ Deleted audit #{audit['id']}")
                             st.rerun()
                         else:
                             # First click - show confirmation
-                            st.session_state[f"confirm_delete_{audit['id']}"] = True
+                            st.session_state.pending_delete_id = audit['id']
                             st.rerun()
 
                     # Show confirmation message if this audit is pending deletion
-                    if st.session_state.get(f"confirm_delete_{audit['id']}", False):
+                    if st.session_state.pending_delete_id == audit['id']:
                         st.warning("Click 🗑️ again to confirm")
 
                 with col2:
                     input_value = audit.get('input_value', 'Unknown')
-                    timestamp = audit.get('timestamp', '')
-                    try:
-                        dt = datetime.fromisoformat(timestamp)
-                        formatted_time = dt.strftime("%Y-%m-%d %H:%M:%S")
-                    except:
-                        formatted_time = timestamp
+                    formatted_time = audit.get('_formatted_time') or _format_iso(audit.get('timestamp') or '')
                     
                     st.markdown(f"**{input_value}**")
                     st.caption(f"🕒 {formatted_time}")
@@ -1277,20 +1408,27 @@ elif st.session_state.current_page == "History":
                         st.rerun()
                 
                 with col5:
-                    # Export button in history
-                    output_dir = Path(audit.get('output_dir', 'outputs'))
-                    markdown_path = output_dir / "audit_report.md"
-                    
-                    if markdown_path.exists():
-                        with open(markdown_path, 'rb') as file:
+                    # Export button in history; the report is only read once the row is prepared
+                    export_ready = st.session_state.export_target_id == audit['id']
+                    if history_manager.report_available(audit) and export_ready:
+                        try:
+                            report_bytes = audit['_markdown_path'].read_bytes()
+                        except OSError:
+                            report_bytes = None
+                            st.session_state.export_target_id = None
+                        if report_bytes is not None:
                             st.download_button(
-                                "📥 Export",
-                                data=file.read(),
+                                "📥 Download",
+                                data=report_bytes,
                                 file_name=f"audit_{audit['id']}.md",
                                 mime="text/markdown",
                                 key=f"download_{audit['id']}",
                                 use_container_width=True
                             )
+                    elif history_manager.report_available(audit):
+                        if st.button("📥 Export", key=f"prepare_{audit['id']}", use_container_width=True):
+                            st.session_state.export_target_id = audit['id']
+                            st.rerun()
                     else:
                         st.button(
                             "📥 Export",
@@ -1329,7 +1467,7 @@ elif st.session_state.current_page == "History":
             if st.button("🗑️ Delete Filtered Audits", type="secondary", use_container_width=True):
                 if st.session_state.get("confirm_delete_filtered", False):
                     # Second click - actually delete filtered
-                    filtered_audit_ids = [audit['id'] for audit in filtered_history[:items_per_page]]
+                    filtered_audit_ids = [audit['id'] for audit in history_window]
                     history_manager.delete_audits(filtered_audit_ids)
                     st.success(f"✅ Deleted {len(filtered_audit_ids)} filtered audits")
                     st.rerun()
@@ -1339,7 +1477,7 @@ elif st.session_state.current_page == "History":
                     st.rerun()
             
             if st.session_state.get("confirm_delete_filtered", False):
-                st.error(f"⚠️ This will delete {len(filtered_history[:items_per_page])} audits. Click again to confirm.")
+                st.error(f"⚠️ This will delete {len(history_window)} audits. Click again to confirm.")
         
 elif st.session_state.current_page == "About":
     st.markdown("## ℹ️ About Design Assistant")
@@ -8,7 +8,7 @@ from .pipeline import DesignAssistant, InputMode
 
 
 def parse_args() -> argparse.Namespace:
-    parser = argparse.ArgumentParser(description="Run the Design Fairness Assistant")
+    parser = argparse.ArgumentParser(description="Run the Design Fairness Assistant", allow_abbrev=False)
     parser.add_argument("mode", choices=[item.value for item in InputMode])
     parser.add_argument("value", help="URL or path to screenshot, depending on mode")
     parser.add_argument(
@@ -31,7 +31,7 @@ def main() -> None:
         print(f"Accessibility Score: {result.accessibility.score:.2f}")
     print(f"Contrast Average: {result.contrast.average_contrast:.2f}")
     print(f"Ethical UX Score: {result.dark_patterns.score:.2f}")
-    print(f"Artifacts written to {args.output_dir.resolve()}")
+    print(f"Artifacts written to {args.output_dir.absolute()}")
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -10,7 +10,7 @@ except ImportError:  # pragma: no cover - optional dependency
     Axe = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AccessibilityViolation:
     """Represents a single axe-core violation."""
 
@@ -20,8 +20,17 @@ class AccessibilityViolation:
     help_url: Optional[str]
     nodes: List[str]
 
+    def to_dict(self) -> dict:
+        return {
+            "violation_id": self.violation_id,
+            "impact": self.impact,
+            "description": self.description,
+            "help_url": self.help_url,
+            "nodes": self.nodes,
+        }
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AccessibilityReport:
     """Summary of accessibility findings."""
 
@@ -32,7 +41,7 @@ class AccessibilityReport:
     def to_dict(self) -> dict:
         return {
             "score": self.score,
-            "violations": [violation.__dict__ for violation in self.violations],
+            "violations": [violation.to_dict() for violation in self.violations],
             "raw_results": self.raw_results,
         }
 
@@ -42,6 +51,7 @@ class AccessibilityAuditor:
 
     def __init__(self, *, baseline: int = 25) -> None:
         self.baseline = max(baseline, 1)
+        self._inv_baseline = 1.0 / self.baseline
 
     def audit(self, driver: Any) -> AccessibilityReport:
         if Axe is None:
@@ -54,7 +64,7 @@ class AccessibilityAuditor:
         return self.audit_from_raw(results)
 
     def audit_from_raw(self, results: Optional[dict]) -> AccessibilityReport:
-        violations_json = (results or {}).get("violations", []) if results else []
+        violations_json = (results or {}).get("violations", [])
         violations = [
             AccessibilityViolation(
                 violation_id=item.get("id", "unknown"),
@@ -65,6 +75,5 @@ class AccessibilityAuditor:
             )
             for item in violations_json
         ]
-        penalty = len(violations) / self.baseline
-        score = max(0.0, 1.0 - penalty)
+        score = max(0.0, 1.0 - len(violations) * self._inv_baseline)
         return AccessibilityReport(score=score, violations=violations, raw_results=results)
@@ -1,17 +1,34 @@
 """Detection of dark patterns using transformer models or keyword heuristics."""
 from __future__ import annotations
 
+import os
 import re
+import threading
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
 
 try:
     from transformers import pipeline
 except ImportError: 
     pipeline = None
 
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional dependency
+    ahocorasick = None
+
+# Exported/quantized ONNX models are cached here so export only happens once per model
+ONNX_CACHE_DIR = Path.home() / ".cache" / "design_assistant" / "onnx"
+
+# Loaded classifiers shared by every auditor in the process, keyed by (model, device, dtype, backend)
+_PIPELINE_CACHE: Dict[tuple, Any] = {}
+_PIPELINE_LOCK = threading.Lock()
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DarkPatternFlag:
     """Represents a suspected dark pattern segment."""
 
@@ -23,7 +40,7 @@ class DarkPatternFlag:
         return {"label": self.label, "score": self.score, "text": self.text}
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DarkPatternReport:
     """Summary of NLP-based dark pattern detections."""
 
@@ -34,7 +51,10 @@ class DarkPatternReport:
     def to_dict(self) -> dict:
         return {
             "score": self.score,
-            "flags": [flag.to_dict() for flag in self.flags],
+            # Inlined DarkPatternFlag.to_dict to skip a method call per flag
+            "flags": [
+                {"label": flag.label, "score": flag.score, "text": flag.text} for flag in self.flags
+            ],
             "raw_outputs": self.raw_outputs,
         }
 
@@ -42,17 +62,29 @@ class DarkPatternReport:
 class DarkPatternAuditor:
     """Uses transformers or heuristics to detect ethical UX violations."""
 
+    # Sentence-ending punctuation followed by whitespace; compiled once per process
+    _sentence_boundary = re.compile(r"[.!?]+\s+")
+
     def __init__(
         self,
         model_name_or_path: str = "",
         *,
         threshold: float = 0.5,
         labels: Optional[List[str]] = None,
+        batch_size: int = 32,
+        keyword_gate: bool = True,
+        num_threads: Optional[int] = None,
     ) -> None:
+        if num_threads:
+            self._set_torch_threads(num_threads)
         self.threshold = threshold
+        self.batch_size = max(batch_size, 1)
+        self.keyword_gate = keyword_gate
         self.labels = labels or ["Urgency", "Confirm-shaming", "Misdirection"]
         self._classifier = self._build_classifier(model_name_or_path)
         self._keyword_map = self._default_keyword_map()
+        self._keyword_labels = list(self._keyword_map)
+        self._keyword_automaton = self._build_keyword_automaton(self._keyword_map)
         self._max_sentence_chars = 1500
         self._classifier_params: Dict[str, object] = {}
 
@@ -72,19 +104,34 @@ class DarkPatternAuditor:
         raw_outputs: List[dict] = []
 
         if self._classifier is not None:
-            for sentence in sentences:
-                try:
-                    result = self._classifier(sentence, **self._classifier_params)
-                except Exception as err:  # pragma: no cover - defensive runtime guard
-                    raw_outputs.append({"sentence": sentence, "error": str(err)})
+            candidates = sentences
+            if self.keyword_gate:
+                # Cheap keyword cascade: only sentences with dark-pattern vocabulary reach the model
+                candidates = [sentence for sentence in sentences if self._has_keyword(sentence.lower())]
+                if not candidates:
+                    return DarkPatternReport(score=1.0, flags=[], raw_outputs=None)
+
+            # Gather columns first, then threshold all sentences in one vectorised pass
+            texts: List[str] = []
+            labels: List[str] = []
+            scores: List[float] = []
+            for sentence, result in zip(candidates, self._classify(candidates)):
+                if isinstance(result, Exception):
+                    raw_outputs.append({"sentence": sentence, "error": str(result)})
                     continue
 
-                top = result[0]
+                top = result[0] if isinstance(result, list) else result
                 raw_outputs.append({"sentence": sentence, **top})
-                label = top["label"].replace("LABEL_", "").strip()
-                score = float(top.get("score", 0.0))
-                if label in self.labels and score >= self.threshold:
-                    flags.append(DarkPatternFlag(label=label, score=score, text=sentence))
+                texts.append(sentence)
+                labels.append(top["label"].replace("LABEL_", "").strip())
+                scores.append(float(top.get("score", 0.0)))
+
+            score_array = np.asarray(scores, dtype=np.float64)
+            mask = (score_array >= self.threshold) & np.isin(np.asarray(labels, dtype=object), self.labels)
+            flags = [
+                DarkPatternFlag(label=labels[index], score=scores[index], text=texts[index])
+                for index in np.flatnonzero(mask)
+            ]
         else:
             for sentence in sentences:
                 label, score = self._heuristic_score(sentence)
@@ -95,11 +142,37 @@ class DarkPatternAuditor:
         ethical_score = max(0.0, 1.0 - violation_ratio)
         return DarkPatternReport(score=ethical_score, flags=flags, raw_outputs=raw_outputs or None)
 
+    def _classify(self, sentences: List[str]) -> List[object]:
+        """Run the classifier over all sentences in length-sorted batches.
+
+        Results come back in input order; if the batched call fails, each
+        sentence is retried alone and failures are returned as exceptions.
+        """
+        if not sentences:
+            return []
+        # Similar lengths per batch keep padding to a minimum
+        order = sorted(range(len(sentences)), key=lambda index: len(sentences[index]))
+        ordered = [sentences[index] for index in order]
+        try:
+            ordered_results = list(
+                self._classifier(ordered, batch_size=self.batch_size, **self._classifier_params)
+            )
+        except Exception:  # pragma: no cover - defensive runtime guard
+            ordered_results = []
+            for sentence in ordered:
+                try:
+                    ordered_results.append(self._classifier(sentence, **self._classifier_params))
+                except Exception as err:
+                    ordered_results.append(err)
+
+        results: List[object] = [None] * len(sentences)
+        for index, result in zip(order, ordered_results):
+            results[index] = result
+        return results
+
     def _split_text(self, text: str) -> List[str]:
-        sentences = re.split(r"(?<=[.!?])\s+", text)
         chunks: List[str] = []
-        for sentence in sentences:
-            clean = sentence.strip()
+        for clean in self._iter_sentences(text):
             if len(clean) <= 20:
                 continue
             if len(clean) <= self._max_sentence_chars:
@@ -113,17 +186,126 @@ class DarkPatternAuditor:
                     chunks.append(part)
         return chunks
 
+    def _iter_sentences(self, text: str):
+        """Yield stripped sentences, splitting after each run of ``.``, ``!`` or ``?``."""
+        start = 0
+        for match in self._sentence_boundary.finditer(text):
+            yield text[start : match.end()].strip()
+            start = match.end()
+        yield text[start:].strip()
+
     def _build_classifier(self, model_name_or_path: str):
         if pipeline is None:
             return None
         target = model_name_or_path or "distilbert-base-uncased-finetuned-sst-2-english"
+        device = os.getenv("DA_DEVICE", "cpu")
+        use_onnx = os.getenv("DA_ONNX") == "1"
+        key = (target, device, "float16" if device.startswith("cuda") else "float32", use_onnx)
+        with _PIPELINE_LOCK:
+            if key not in _PIPELINE_CACHE:
+                classifier = self._load_classifier(target, device, use_onnx)
+                if classifier is None:
+                    # Failures are not cached so a later auditor can retry the load
+                    return None
+                _PIPELINE_CACHE[key] = classifier
+            return _PIPELINE_CACHE[key]
+
+    def _load_classifier(self, target: str, device: str, use_onnx: bool):
+        if use_onnx:
+            classifier = self._build_onnx_classifier(target)
+            if classifier is not None:
+                return classifier
+        kwargs: Dict[str, Any] = {"use_fast": True, "device": device}
+        if device.startswith("cuda"):
+            try:
+                import torch
+
+                kwargs["torch_dtype"] = torch.float16
+            except ImportError:  # pragma: no cover - optional dependency
+                pass
         try:
-            return pipeline("text-classification", model=target)
+            return pipeline("text-classification", model=target, **kwargs)
         except Exception:
             return None
 
+    @staticmethod
+    def _set_torch_threads(num_threads: int) -> None:
+        """Cap intra-op CPU threads; torch applies this process-wide, so only on request."""
+        try:
+            import torch
+
+            torch.set_num_threads(num_threads)
+        except ImportError:  # pragma: no cover - optional dependency
+            pass
+
+    def _build_onnx_classifier(self, target: str):
+        """Opt-in (``DA_ONNX=1``) dynamic-INT8 ONNX Runtime classifier, or None on any failure."""
+        try:
+            from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+            from optimum.onnxruntime.configuration import AutoQuantizationConfig
+            from optimum.pipelines import pipeline as ort_pipeline
+            from transformers import AutoTokenizer
+        except ImportError:  # pragma: no cover - optional dependency
+            return None
+
+        model_dir = ONNX_CACHE_DIR / re.sub(r"[^\w.-]+", "_", target)
+        quantized_dir = model_dir / "int8"
+        try:
+            if not (quantized_dir / "model_quantized.onnx").exists():
+                model = ORTModelForSequenceClassification.from_pretrained(target, export=True)
+                tokenizer = AutoTokenizer.from_pretrained(target, use_fast=True)
+                model.save_pretrained(model_dir)
+                quantizer = ORTQuantizer.from_pretrained(model)
+                quantizer.quantize(
+                    save_dir=quantized_dir,
+                    quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False),
+                )
+                tokenizer.save_pretrained(quantized_dir)
+
+            model = ORTModelForSequenceClassification.from_pretrained(
+                quantized_dir, file_name="model_quantized.onnx"
+            )
+            tokenizer = AutoTokenizer.from_pretrained(quantized_dir, use_fast=True)
+            return ort_pipeline(
+                "text-classification", model=model, tokenizer=tokenizer, accelerator="ort"
+            )
+        except Exception:
+            return None
+
+    @staticmethod
+    def _build_keyword_automaton(keyword_map: Dict[str, List[str]]):
+        """Aho-Corasick automaton over all keywords, or None without pyahocorasick."""
+        if ahocorasick is None:
+            return None
+        automaton = ahocorasick.Automaton()
+        for label_index, keywords in enumerate(keyword_map.values()):
+            for keyword in keywords:
+                automaton.add_word(keyword, (label_index, keyword))
+        automaton.make_automaton()
+        return automaton
+
+    def _has_keyword(self, sentence_lower: str) -> bool:
+        if self._keyword_automaton is not None:
+            return next(self._keyword_automaton.iter(sentence_lower), None) is not None
+        return any(
+            keyword in sentence_lower
+            for keywords in self._keyword_map.values()
+            for keyword in keywords
+        )
+
     def _heuristic_score(self, sentence: str) -> tuple[str, float]:
         sentence_lower = sentence.lower()
+        if self._keyword_automaton is not None:
+            # One pass over the sentence; distinct keywords per label, first label in map order wins
+            hits: Dict[int, set] = {}
+            for _, (label_index, keyword) in self._keyword_automaton.iter(sentence_lower):
+                hits.setdefault(label_index, set()).add(keyword)
+            if not hits:
+                return "", 0.0
+            label_index = min(hits)
+            label = self._keyword_labels[label_index]
+            return label, min(0.9, 0.4 + 0.2 * len(hits[label_index]))
+
         for label, keywords in self._keyword_map.items():
             hits = sum(keyword in sentence_lower for keyword in keywords)
             if hits:
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-import base64
+import binascii
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
@@ -8,8 +8,15 @@ from typing import Optional
 import cv2
 import numpy as np
 
+# Leading bytes of each encoding, keyed by file suffix; used to skip re-encoding on save
+FORMAT_SIGNATURES = {
+    ".png": b"\x89PNG\r\n\x1a\n",
+    ".jpg": b"\xff\xd8\xff",
+    ".jpeg": b"\xff\xd8\xff",
+}
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class ScreenshotArtifacts:
     """Represents an image on disk and its numpy array representation."""
 
@@ -18,26 +25,88 @@ class ScreenshotArtifacts:
 
 
 class ScreenshotLoader:
-    """Loads screenshots from file paths or base64-encoded payloads."""
+    """Loads screenshots from file paths or base64-encoded payloads.
+
+    ``encode_format`` ("png" or "jpg") selects how captured screenshots are
+    encoded. PNG is lossless; JPEG encodes much faster on large pages and is
+    enough for the perceptual audits.
+
+    ``decode_mode`` (any ``cv2.IMREAD_*`` flag) and ``scale`` shrink the
+    decoded array for consumers that do not need full-resolution BGR. The
+    contrast auditor expects 3-channel BGR, so keep ``IMREAD_COLOR`` (or a
+    ``IMREAD_REDUCED_COLOR_*`` mode) when the image feeds the pipeline.
+    """
+
+    def __init__(
+        self,
+        *,
+        encode_format: str = "png",
+        decode_mode: int = cv2.IMREAD_COLOR,
+        scale: float = 1.0,
+    ) -> None:
+        if encode_format not in ("png", "jpg"):
+            raise ValueError(f"Unsupported screenshot format: {encode_format}")
+        if scale <= 0:
+            raise ValueError("Screenshot scale must be positive")
+        self.encode_format = encode_format
+        self.decode_mode = decode_mode
+        self.scale = scale
+
+    def _resize(self, image: np.ndarray) -> np.ndarray:
+        if self.scale == 1.0:
+            return image
+        return cv2.resize(image, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+
+    def encode(self, image: np.ndarray) -> bytes:
+        if self.encode_format == "jpg":
+            params = [cv2.IMWRITE_JPEG_QUALITY, 85]
+        else:
+            params = [cv2.IMWRITE_PNG_COMPRESSION, 1]
+        ok, encoded = cv2.imencode(f".{self.encode_format}", image, params)
+        if not ok:
+            raise ValueError("Failed to encode screenshot")
+        return encoded.tobytes()
 
     def load_from_path(self, path: str | Path) -> ScreenshotArtifacts:
         path = Path(path)
-        image = cv2.imread(str(path))
+        image = cv2.imread(str(path), self.decode_mode)
         if image is None:
             raise ValueError(f"Unable to read screenshot at {path}")
-        return ScreenshotArtifacts(path=path, image=image)
+        return ScreenshotArtifacts(path=path, image=self._resize(image))
+
+    def load_from_bytes(
+        self, payload: bytes, *, output_path: Optional[Path] = None, persist: bool = True
+    ) -> ScreenshotArtifacts:
+        """Decode an encoded image; with ``persist`` it is also written to ``output_path``.
 
-    def load_from_bytes(self, payload: bytes, *, output_path: Optional[Path] = None) -> ScreenshotArtifacts:
+        When ``persist`` is False nothing is written and ``path`` is only the nominal location.
+        """
         array = np.frombuffer(payload, dtype=np.uint8)
-        image = cv2.imdecode(array, cv2.IMREAD_COLOR)
+        image = cv2.imdecode(array, self.decode_mode)
         if image is None:
             raise ValueError("Invalid image byte payload")
+        image = self._resize(image)
         if output_path is None:
             output_path = Path("outputs/screenshot.png")
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        cv2.imwrite(str(output_path), image)
+        if persist:
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            signature = FORMAT_SIGNATURES.get(output_path.suffix.lower())
+            unchanged = self.scale == 1.0 and self.decode_mode == cv2.IMREAD_COLOR
+            if unchanged and signature is not None and payload.startswith(signature):
+                # Already encoded in the target format and decoded as-is; skip the re-encode
+                output_path.write_bytes(payload)
+            else:
+                cv2.imwrite(str(output_path), image)
         return ScreenshotArtifacts(path=output_path, image=image)
 
-    def load_from_base64(self, data: str, *, output_path: Optional[Path] = None) -> ScreenshotArtifacts:
-        raw = base64.b64decode(data)
+    def load_from_base64(self, data: str | bytes, *, output_path: Optional[Path] = None) -> ScreenshotArtifacts:
+        if isinstance(data, str):
+            if data.startswith("data:"):
+                # Drop a "data:image/png;base64," prefix
+                data = data.partition(",")[2]
+            data = data.encode("ascii", "ignore")
+        try:
+            raw = binascii.a2b_base64(data)
+        except binascii.Error as exc:
+            raise ValueError("Invalid base64 screenshot payload") from exc
         return self.load_from_bytes(raw, output_path=output_path)
@@ -2,21 +2,36 @@
 from __future__ import annotations
 
 import os
+import base64
+import functools
 import json
+import queue
 import shutil
+import threading
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Callable, Optional, Protocol
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Optional, Protocol
+from urllib.parse import urlsplit
+
+import cv2
+import numpy as np
 
 try:
     from selenium import webdriver
     from selenium.webdriver.common.by import By
     from selenium.webdriver.chrome.service import Service as ChromeService  # type: ignore[import]
+    from selenium.webdriver.support.ui import WebDriverWait
 except ImportError:  # pragma: no cover - optional dependency
     webdriver = None
     By = None
     ChromeService = None
+    WebDriverWait = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
 
 try:
     from axe_selenium_python import Axe  # type: ignore[import]
@@ -45,7 +60,7 @@ class DriverFactory(Protocol):
         ...
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SeleniumArtifacts:
     """Artifacts captured from a live URL."""
 
@@ -58,6 +73,129 @@ class SeleniumArtifacts:
     accessibility: Optional[AccessibilityReport]
 
 
+# Queued in place of a driver that was discarded, so a waiting thread
+# starts a replacement instead of blocking forever.
+_EMPTY_SLOT = object()
+
+
+class DriverPool:
+    """Keeps up to ``max_workers`` WebDriver sessions alive across collections.
+
+    Starting headless Chrome dominates small-page audits, so drivers are
+    reset and reused instead of being quit after every URL. The reset
+    clears all site data (cookies, local/session storage, IndexedDB,
+    service workers, cache) of every origin visited during the borrow, so
+    a dismissed consent banner does not change the next audit's DOM; then
+    it loads a blank page and restores the original window size. Drivers
+    without Chrome DevTools can only clear the current origin's web
+    storage and the cookies.
+
+    Pooling is opt-in: pass a pool to ``SeleniumCollector(driver_pool=...)``
+    and ``close()`` it when done. Without one, each collection starts and
+    quits its own driver.
+    """
+
+    def __init__(self, driver_factory: DriverFactory, *, max_workers: int = 1) -> None:
+        self.driver_factory = driver_factory
+        self.max_workers = max(max_workers, 1)
+        self._idle: "queue.Queue[Any]" = queue.Queue()
+        self._window_sizes: dict = {}
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> Any:
+        try:
+            driver = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_create = self._created < self.max_workers
+                if can_create:
+                    self._created += 1
+            driver = _EMPTY_SLOT if can_create else self._idle.get()
+        if driver is not _EMPTY_SLOT:
+            return driver
+        try:
+            driver = self.driver_factory()
+        except Exception:
+            self._idle.put(_EMPTY_SLOT)
+            raise
+        try:
+            self._window_sizes[id(driver)] = driver.get_window_size()
+        except Exception:
+            pass
+        return driver
+
+    def release(self, driver: Any, visited: Iterable[str] = ()) -> None:
+        """Reset ``driver`` and return it to the pool.
+
+        ``visited`` lists the URLs loaded during the borrow; the current
+        page's URL (after any redirects) is always included.
+        """
+        try:
+            self._reset(driver, visited)
+        except Exception:
+            self.discard(driver)
+            return
+        self._idle.put(driver)
+
+    def discard(self, driver: Any) -> None:
+        self._quit(driver)
+        self._idle.put(_EMPTY_SLOT)
+
+    def close(self) -> None:
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._created -= 1
+            if driver is not _EMPTY_SLOT:
+                self._quit(driver)
+
+    def _quit(self, driver: Any) -> None:
+        self._window_sizes.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def _reset(self, driver: Any, visited: Iterable[str] = ()) -> None:
+        origins = {_origin(url) for url in (*visited, driver.current_url)} - {None}
+        if hasattr(driver, "execute_cdp_cmd"):
+            driver.get("about:blank")
+            for origin in origins:
+                driver.execute_cdp_cmd(
+                    "Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"}
+                )
+            driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        else:
+            # Without CDP only the current origin's web storage is reachable
+            driver.execute_script(
+                "try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}"
+            )
+            driver.delete_all_cookies()
+            driver.get("about:blank")
+        size = self._window_sizes.get(id(driver))
+        if size:
+            driver.set_window_size(size["width"], size["height"])
+
+    def __enter__(self) -> "DriverPool":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def _origin(url: str) -> Optional[str]:
+    """``scheme://host[:port]`` of an http(s) URL, else None."""
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        return None
+    return f"{parts.scheme}://{parts.netloc.rpartition('@')[2]}"
+
+
 class SeleniumCollector:
     """Fetches page artifacts using a provided Selenium WebDriver."""
 
@@ -65,13 +203,16 @@ class SeleniumCollector:
         self,
         driver_factory: Optional[DriverFactory] = None,
         *,
-        sleep_after_load: float = 2.0,
+        sleep_after_load: float = 0.0,
         timeout: int = 30,
+        screenshot_format: str = "png",
+        driver_pool: Optional[DriverPool] = None,
     ) -> None:
         self.driver_factory = driver_factory or self._default_driver_factory
+        self.driver_pool = driver_pool
         self.sleep_after_load = sleep_after_load
         self.timeout = timeout
-        self.screenshot_loader = ScreenshotLoader()
+        self.screenshot_loader = ScreenshotLoader(encode_format=screenshot_format)
 
     def collect(self, url: str, *, output_dir: Path) -> SeleniumArtifacts:
         if webdriver is None:
@@ -80,26 +221,30 @@ class SeleniumCollector:
             )
 
         output_dir.mkdir(parents=True, exist_ok=True)
-        driver = self.driver_factory()
+        driver = self.acquire_driver()
         dom_path = output_dir / "page_dom.html"
         visible_text = ""
-        screenshot_path = output_dir / "screenshot.png"
+        screenshot_path = output_dir / f"screenshot.{self.screenshot_loader.encode_format}"
         axe_json_path = None
         axe_results: Optional[dict] = None
         accessibility_report = None
         try:
             driver.set_page_load_timeout(self.timeout)
             driver.get(url)
-            time.sleep(self.sleep_after_load)
-
-            dom_path.write_text(driver.page_source, encoding="utf-8")
-
-            if By is not None:
-                try:
-                    body = driver.find_element(By.TAG_NAME, "body")
-                    visible_text = body.text
-                except Exception:
-                    visible_text = ""
+            self.wait_for_load(driver)
+
+            page = self._read_page_content(driver)
+            if page is not None:
+                dom_html, visible_text = page
+                dom_path.write_text(dom_html, encoding="utf-8")
+            else:
+                dom_path.write_text(driver.page_source, encoding="utf-8")
+                if By is not None:
+                    try:
+                        body = driver.find_element(By.TAG_NAME, "body")
+                        visible_text = body.text
+                    except Exception:
+                        visible_text = ""
 
             # Capture full-page screenshot (including content below fold)
             screenshot_bytes = self._capture_full_page_screenshot(driver)
@@ -120,8 +265,7 @@ class SeleniumCollector:
 
                 axe_json_path = output_dir / "axe_results.json"
                 try:
-                    with open(axe_json_path, "w", encoding="utf-8") as f:
-                        json.dump(axe_results, f, ensure_ascii=False, indent=2)
+                    self._write_json(axe_json_path, axe_results)
                 except Exception:
                     # As a last resort, use library writer if available
                     try:
@@ -129,7 +273,7 @@ class SeleniumCollector:
                     except Exception:
                         pass
         finally:
-            driver.quit()
+            self.release_driver(driver, visited=(url,))
 
         return SeleniumArtifacts(
             url=url,
@@ -141,6 +285,79 @@ class SeleniumCollector:
             accessibility=accessibility_report,
         )
 
+    def acquire_driver(self) -> Any:
+        """Borrow a driver from the pool, or start a fresh one without a pool."""
+        if self.driver_pool is not None:
+            return self.driver_pool.acquire()
+        return self.driver_factory()
+
+    def release_driver(self, driver: Any, visited: Iterable[str] = ()) -> None:
+        """Return a driver to the pool, or quit it without a pool.
+
+        ``visited`` names the URLs loaded with it, whose site data the pool clears.
+        """
+        if self.driver_pool is not None:
+            self.driver_pool.release(driver, visited)
+        else:
+            driver.quit()
+
+    @staticmethod
+    def _write_json(path: Path, data: Any) -> None:
+        """Write indented UTF-8 JSON, using orjson when it is installed."""
+        if orjson is not None:
+            path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+            return
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+    def wait_for_load(self, driver: Any) -> None:
+        """Wait until the document and its started resource fetches are complete.
+
+        Any ``sleep_after_load`` is added afterwards as extra settle time.
+        """
+        if WebDriverWait is not None:
+            script = (
+                "return document.readyState === 'complete' && "
+                "performance.getEntriesByType('resource').every(r => r.responseEnd > 0)"
+            )
+            try:
+                WebDriverWait(driver, self.timeout, poll_frequency=0.1).until(
+                    lambda d: d.execute_script(script)
+                )
+            except Exception:
+                pass
+        if self.sleep_after_load > 0:
+            time.sleep(self.sleep_after_load)
+
+    @staticmethod
+    def _wait_for_paint(driver: Any) -> None:
+        """Block until the browser has produced a frame after the last layout change."""
+        try:
+            driver.execute_async_script(
+                "const done = arguments[0];"
+                "requestAnimationFrame(() => requestAnimationFrame(() => done(true)));"
+            )
+        except Exception:
+            time.sleep(0.2)
+
+    def _read_page_content(self, driver: Any) -> Optional[tuple[str, str]]:
+        """Fetch serialized DOM and visible body text in one script round-trip.
+
+        Serializes the same way ChromeDriver's ``page_source`` does; returns
+        None if the script fails so the caller can use the two-call path.
+        """
+        script = """
+        return JSON.stringify({
+            html: new XMLSerializer().serializeToString(document),
+            text: document.body ? document.body.innerText : ""
+        });
+        """
+        try:
+            payload = json.loads(driver.execute_script(script))
+            return payload["html"], payload["text"]
+        except Exception:
+            return None
+
     def _run_axe_minimal(self, driver: Any) -> dict:
         """Run axe-core in the page and return a minimal, serializable result.
 
@@ -247,77 +464,59 @@ class SeleniumCollector:
             raise RuntimeError(guidance) from exc
 
     def _resolve_chrome_binary(self) -> Optional[str]:
-        explicit = os.getenv("CHROME_BINARY")
-        if explicit and Path(explicit).exists():
-            return explicit
-
-        # Windows-specific paths (PowerShell/native Windows)
-        windows_candidates = [
-            r"C:\Program Files\Google\Chrome\Application\chrome.exe",
-            r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
-            os.path.expandvars(r"%LOCALAPPDATA%\Google\Chrome\Application\chrome.exe"),
-            os.path.expandvars(r"%PROGRAMFILES%\Google\Chrome\Application\chrome.exe"),
-            os.path.expandvars(r"%PROGRAMFILES(X86)%\Google\Chrome\Application\chrome.exe"),
-        ]
-        
-        # WSL-specific paths (Linux subsystem)
-        wsl_candidates = [
-            "/mnt/c/Program Files/Google/Chrome/Application/chrome.exe",
-            "/mnt/c/Program Files (x86)/Google/Chrome/Application/chrome.exe",
-        ]
-        
-        # Linux native paths
-        linux_candidates = [
-            shutil.which("google-chrome"),
-            shutil.which("google-chrome-stable"),
-            shutil.which("chrome"),
-            "/opt/google/chrome/chrome",
-            "/usr/bin/google-chrome",
-        ]
-        
-        # Combine all candidates
-        candidates = windows_candidates + wsl_candidates + linux_candidates
-        
-        for candidate in candidates:
-            if candidate and Path(candidate).exists():
-                return str(candidate)
-        return None
+        return _resolve_chrome_binary()
 
     def _resolve_chromedriver_path(self) -> Optional[str]:
-        explicit = os.getenv("CHROMEDRIVER_PATH")
-        if explicit and Path(explicit).exists():
-            return explicit
-
-        system_driver = shutil.which("chromedriver")
-        if system_driver:
-            return system_driver
-
-        if ChromeDriverManager is not None:
-            try:
-                kwargs = {"chrome_type": ChromeType.GOOGLE} if ChromeType is not None else {}
-                return ChromeDriverManager(**kwargs).install()
-            except Exception:
-                return None
-        return None
+        return _resolve_chromedriver_path()
     
     def _capture_full_page_screenshot(self, driver: Any) -> bytes:
         """Capture full-page screenshot including content below the fold.
         
+        Uses a single CDP capture on Chromium drivers and falls back to
+        scrolling and stitching viewport screenshots elsewhere.
+        
         Args:
             driver: Selenium WebDriver instance
             
         Returns:
             PNG screenshot bytes of the entire page
         """
-        # Get full page dimensions
-        total_width = driver.execute_script("return document.body.scrollWidth")
-        total_height = driver.execute_script("return document.body.scrollHeight")
-        viewport_width = driver.execute_script("return window.innerWidth")
-        viewport_height = driver.execute_script("return window.innerHeight")
+        if hasattr(driver, "execute_cdp_cmd"):
+            try:
+                return self._capture_cdp_screenshot(driver)
+            except Exception:
+                pass
+        return self._capture_stitched_screenshot(driver)
+
+    def _capture_cdp_screenshot(self, driver: Any) -> bytes:
+        """Capture the whole page in one compositor pass via ``Page.captureScreenshot``."""
+        metrics = driver.execute_cdp_cmd("Page.getLayoutMetrics", {})
+        content = metrics.get("cssContentSize") or metrics["contentSize"]
+        width, height = int(content["width"]), int(content["height"])
+        driver.execute_cdp_cmd(
+            "Emulation.setDeviceMetricsOverride",
+            {"width": width, "height": height, "deviceScaleFactor": 1, "mobile": False},
+        )
+        params = {"format": "png", "captureBeyondViewport": True, "fromSurface": True}
+        if self.screenshot_loader.encode_format == "jpg":
+            params.update(format="jpeg", quality=85)
+        try:
+            result = driver.execute_cdp_cmd("Page.captureScreenshot", params)
+        finally:
+            driver.execute_cdp_cmd("Emulation.clearDeviceMetricsOverride", {})
+        return base64.b64decode(result["data"])
+
+    def _capture_stitched_screenshot(self, driver: Any) -> bytes:
+        """Scroll the viewport and stitch the captures into one PNG."""
+        # Get full page dimensions in a single round-trip
+        total_width, total_height, viewport_width, viewport_height = driver.execute_script(
+            "return [document.body.scrollWidth, document.body.scrollHeight, "
+            "window.innerWidth, window.innerHeight]"
+        )
         
         # Set window size to capture full width (height will be handled by scrolling)
         driver.set_window_size(total_width, viewport_height)
-        time.sleep(0.5)  # Let page adjust
+        self._wait_for_paint(driver)  # Let page adjust
         
         # Calculate number of scrolls needed
         rectangles = []
@@ -325,7 +524,7 @@ class SeleniumCollector:
         while i < total_height:
             # Scroll to position
             driver.execute_script(f"window.scrollTo(0, {i})")
-            time.sleep(0.2)  # Brief pause for content to render
+            self._wait_for_paint(driver)  # Wait until the scrolled content has rendered
             
             # Capture viewport
             screenshot_bytes = driver.get_screenshot_as_png()
@@ -336,37 +535,105 @@ class SeleniumCollector:
             
             i += viewport_height
         
-        # Stitch screenshots together using PIL/OpenCV
+        # Stitch by decoding each tile straight into a preallocated canvas
+        canvas = np.zeros((total_height, total_width, 3), dtype=np.uint8)
+        for rect in rectangles:
+            tile = cv2.imdecode(np.frombuffer(rect['screenshot'], np.uint8), cv2.IMREAD_COLOR)
+            if tile is None:
+                continue
+            offset = rect['offset']
+            rows = min(tile.shape[0], total_height - offset)
+            cols = min(tile.shape[1], total_width)
+            canvas[offset:offset + rows, :cols] = tile[:rows, :cols]
+
         try:
-            from PIL import Image
-            import io
-            
-            images = []
-            for rect in rectangles:
-                img = Image.open(io.BytesIO(rect['screenshot']))
-                images.append(img)
-            
-            # Create full canvas
-            full_image = Image.new('RGB', (total_width, total_height))
-            
-            # Paste each screenshot at correct offset
-            current_y = 0
-            for i, img in enumerate(images):
-                full_image.paste(img, (0, current_y))
-                current_y += viewport_height
-                # Handle last image which might be partial
-                if current_y > total_height:
-                    break
-            
-            # Crop to exact height
-            full_image = full_image.crop((0, 0, total_width, total_height))
-            
-            # Convert to bytes
-            output = io.BytesIO()
-            full_image.save(output, format='PNG')
-            return output.getvalue()
-            
-        except ImportError:
-            # Fallback: if PIL not available, return single viewport screenshot
+            return self.screenshot_loader.encode(canvas)
+        except ValueError:
             driver.execute_script("window.scrollTo(0, 0)")
             return driver.get_screenshot_as_png()
+
+
+def _cache_found(func: Callable[[], Optional[str]]) -> Callable[[], Optional[str]]:
+    """Memoize a lookup once it succeeds; a ``None`` result is retried on the next call.
+
+    Keeps a transient failure (no network for the driver download, Chrome
+    installed after start-up) from disabling Selenium for a long-running
+    process.
+    """
+    found: Optional[str] = None
+    lock = threading.Lock()
+
+    @functools.wraps(func)
+    def wrapper() -> Optional[str]:
+        nonlocal found
+        with lock:
+            if found is None:
+                found = func()
+            return found
+
+    def cache_clear() -> None:
+        nonlocal found
+        found = None
+
+    wrapper.cache_clear = cache_clear  # type: ignore[attr-defined]
+    return wrapper
+
+
+@_cache_found
+def _resolve_chrome_binary() -> Optional[str]:
+    """Locate a Chrome binary once it is found; install locations rarely change at runtime."""
+    explicit = os.getenv("CHROME_BINARY")
+    if explicit and os.path.exists(explicit):
+        return explicit
+
+    # Windows-specific paths (PowerShell/native Windows)
+    windows_candidates = [
+        r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+        r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+        os.path.expandvars(r"%LOCALAPPDATA%\Google\Chrome\Application\chrome.exe"),
+        os.path.expandvars(r"%PROGRAMFILES%\Google\Chrome\Application\chrome.exe"),
+        os.path.expandvars(r"%PROGRAMFILES(X86)%\Google\Chrome\Application\chrome.exe"),
+    ]
+    
+    # WSL-specific paths (Linux subsystem)
+    wsl_candidates = [
+        "/mnt/c/Program Files/Google/Chrome/Application/chrome.exe",
+        "/mnt/c/Program Files (x86)/Google/Chrome/Application/chrome.exe",
+    ]
+    
+    # Linux native paths
+    linux_candidates = [
+        shutil.which("google-chrome"),
+        shutil.which("google-chrome-stable"),
+        shutil.which("chrome"),
+        "/opt/google/chrome/chrome",
+        "/usr/bin/google-chrome",
+    ]
+    
+    # Combine all candidates
+    candidates = windows_candidates + wsl_candidates + linux_candidates
+    
+    for candidate in candidates:
+        if candidate and os.path.exists(candidate):
+            return str(candidate)
+    return None
+
+
+@_cache_found
+def _resolve_chromedriver_path() -> Optional[str]:
+    """Locate (or download) a chromedriver, once it succeeds."""
+    explicit = os.getenv("CHROMEDRIVER_PATH")
+    if explicit and os.path.exists(explicit):
+        return explicit
+
+    system_driver = shutil.which("chromedriver")
+    if system_driver:
+        return system_driver
+
+    if ChromeDriverManager is not None:
+        try:
+            kwargs = {"chrome_type": ChromeType.GOOGLE} if ChromeType is not None else {}
+            return ChromeDriverManager(**kwargs).install()
+        except Exception:
+            return None
+    return None
@@ -5,7 +5,7 @@ from dataclasses import dataclass, field
 from typing import Dict, Optional
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TierScore:
     """Represents a single tier in the hierarchical DFS."""
 
@@ -23,7 +23,7 @@ class TierScore:
         }
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DesignFairnessScore:
     """Hierarchical Design Fairness Score (DFS).
 
@@ -50,8 +50,13 @@ class DesignFairnessScore:
     alpha: float = 0.4
     beta: float = 0.3
 
-    @property
-    def value(self) -> float:
+    # Composite score, computed once in __post_init__ since every input is frozen
+    value: float = field(init=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "value", self._compute_value())
+
+    def _compute_value(self) -> float:
         raw = (
             self.technical.value * self.technical.weight
             + self.perceptual.value * self.perceptual.weight
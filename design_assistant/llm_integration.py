@@ -1,16 +1,726 @@
 from __future__ import annotations
 
+import asyncio
+import dataclasses
+import functools
+import hashlib
+import io
 import json
+import logging
 import os
+import random
 import re
-import textwrap
+import sqlite3
+import threading
+import time
+import traceback
+import weakref
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Optional
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Sequence
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import xxhash
+except ImportError:  # pragma: no cover - optional dependency
+    xxhash = None
 
 try:
-    import google.generativeai as genai
-except ImportError:
-    genai = None
+    from sentence_transformers import SentenceTransformer
+except ImportError:  # pragma: no cover - optional dependency
+    SentenceTransformer = None
+
+
+logger = logging.getLogger(__name__)
+
+
+# The Gemini SDK pulls in gRPC, protobuf and google-auth, so it is imported
+# on first use rather than whenever the pipeline or reporter is imported.
+
+@functools.cache
+def _genai():
+    """Return ``google.generativeai``, or ``None`` when it is not installed."""
+    try:
+        import google.generativeai as genai
+    except ImportError:
+        return None
+    return genai
+
+
+@functools.cache
+def _transient_errors() -> tuple:
+    try:
+        from google.api_core import exceptions as google_exceptions
+    except ImportError:  # pragma: no cover - installed with google-generativeai
+        return ()
+    return (
+        google_exceptions.ResourceExhausted,
+        google_exceptions.ServiceUnavailable,
+        google_exceptions.DeadlineExceeded,
+        google_exceptions.InternalServerError,
+    )
+
+
+def _is_transient(exc: Exception) -> bool:
+    """Whether a Gemini error is worth retrying (rate limit, overload, timeout)."""
+    transient = _transient_errors()
+    if transient and isinstance(exc, transient):
+        return True
+    message = str(exc)
+    return any(marker in message for marker in ("429", "503", "RESOURCE_EXHAUSTED", "UNAVAILABLE"))
+
+
+
+def _configure_logging() -> None:
+    """Honour ``DESIGN_ASSISTANT_LOGLEVEL`` (e.g. ``DEBUG``) for this package.
+
+    Without the variable nothing is configured and the host application's
+    logging setup applies.
+    """
+    level = os.getenv("DESIGN_ASSISTANT_LOGLEVEL")
+    if not level:
+        return
+    package_logger = logging.getLogger(__name__.partition(".")[0])
+    package_logger.setLevel(level.upper())
+    if not package_logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(levelname)s %(name)s: %(message)s"))
+        package_logger.addHandler(handler)
+
+
+_configure_logging()
+
+LLM_CACHE_DIR = Path.home() / ".cache" / "design_assistant" / "llm"
+
+# Longest side, in pixels, of screenshots sent to the model. Gemini tiles
+# images at roughly this resolution, so larger uploads only add bytes.
+MAX_IMAGE_SIDE = 1568
+
+# Output-token caps for the per-section analyses, applied when
+# LLMConfig.section_max_tokens is set. On thinking models (Gemini 2.5) the
+# cap also covers thinking tokens, so it is off by default.
+SECTION_MAX_TOKENS = {
+    "accessibility": 1500,
+    "contrast": 800,
+    "dark_patterns": 1200,
+    "recommendations": 2500,
+}
+
+
+def _json_loads(text: str):
+    """Parse JSON with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _find_json_object(text: str) -> Optional[dict]:
+    """Return the first top-level balanced ``{...}`` in ``text`` that parses as an object.
+
+    A single pass tracks brace depth, skipping braces inside string
+    literals; a candidate that fails to parse moves the search on past its
+    closing brace, so nested fragments are never returned. An object that
+    is never closed (e.g. a truncated response) yields ``None``.
+    """
+    start = text.find("{")
+    while start != -1:
+        depth = 0
+        in_string = escaped = False
+        end = None
+        for index in range(start, len(text)):
+            char = text[index]
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == "\\":
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char == "{":
+                depth += 1
+            elif char == "}":
+                depth -= 1
+                if depth == 0:
+                    end = index + 1
+                    break
+        if end is None:
+            return None
+        try:
+            parsed = _json_loads(text[start:end])
+        except json.JSONDecodeError:
+            parsed = None
+        if isinstance(parsed, dict):
+            return parsed
+        start = text.find("{", end)
+    return None
+
+
+def _json_dumps(data) -> str:
+    """Serialize ``data`` compactly, using orjson when it can handle the payload."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+@functools.cache
+def _pil_image_cls():
+    """Import ``PIL.Image`` on first use; Pillow is only needed for screenshots."""
+    from PIL import Image
+
+    return Image
+
+
+@functools.cache
+def _sentence_encoder(name: str):
+    """Load the semantic-cache embedding model once per process, or ``None``."""
+    if SentenceTransformer is None:
+        logger.warning("semantic_cache needs sentence-transformers; install it to enable the cache")
+        return None
+    try:
+        return SentenceTransformer(name)
+    except Exception as exc:
+        logger.warning("Could not load semantic cache model %s: %s", name, exc)
+        return None
+
+
+@functools.lru_cache(maxsize=8)
+def _encode_image(path: str, mtime_ns: int) -> bytes:
+    PILImage = _pil_image_cls()
+    with PILImage.open(path) as img:
+        img.thumbnail((MAX_IMAGE_SIDE, MAX_IMAGE_SIDE), PILImage.LANCZOS)
+        buffer = io.BytesIO()
+        img.convert("RGB").save(buffer, "JPEG", quality=85, optimize=True)
+    return buffer.getvalue()
+
+
+def _prepare_image(path: str) -> dict:
+    """Return ``path`` as a downscaled JPEG blob for a Gemini content part.
+
+    Encodings are memoized per (path, mtime) so retries and repeated
+    analyses of the same screenshot skip the resize.
+    """
+    return {"mime_type": "image/jpeg", "data": _encode_image(path, os.stat(path).st_mtime_ns)}
+
+
+# ---------------------------------------------------------------------------
+# HTML outline for the comprehensive prompt
+# ---------------------------------------------------------------------------
+
+_OUTLINE_TAGS = frozenset({
+    "main", "nav", "header", "footer", "h1", "h2", "h3", "form",
+    "label", "button", "a", "input", "select", "textarea", "img",
+})
+_OUTLINE_VOID_TAGS = frozenset({"input", "img"})
+_OUTLINE_ATTRS = frozenset({
+    "id", "role", "type", "name", "href", "alt", "for", "placeholder", "title",
+    "tabindex", "lang", "required", "disabled",
+})
+_SKIPPED_TAGS = frozenset({"script", "style", "svg", "noscript", "template"})
+
+
+# Rough stand-in for Gemini's tokenizer: words and individual punctuation
+# marks each count as one token. Markup-heavy text tokenizes far worse than
+# the usual four characters per token, which this captures without a
+# count_tokens round-trip.
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+# Token budget for the HTML section of the comprehensive prompt
+HTML_TOKEN_BUDGET = 4000
+
+# Token budget for the rows listed in each per-section prompt
+ROWS_TOKEN_BUDGET = 1000
+
+
+def _estimate_tokens(text: str) -> int:
+    return sum(1 for _ in _TOKEN_PATTERN.finditer(text))
+
+
+def _truncate_to_tokens(text: str, max_tokens: int) -> tuple[str, bool]:
+    """Cut ``text`` after roughly ``max_tokens`` tokens."""
+    for count, match in enumerate(_TOKEN_PATTERN.finditer(text), start=1):
+        if count == max_tokens:
+            end = match.end()
+            return text[:end], bool(text[end:].strip())
+    return text, False
+
+
+class _OutlineFull(Exception):
+    """Raised to stop parsing once the outline reaches its size budget."""
+
+
+class _HTMLOutline(HTMLParser):
+    """Collects one line per accessibility-relevant element.
+
+    Each line is the element's start tag, reduced to the attributes the audit
+    looks at, followed by its leading text. Script, style and SVG content is
+    skipped entirely.
+    """
+
+    def __init__(self, max_tokens: int):
+        super().__init__(convert_charrefs=True)
+        self.max_tokens = max_tokens
+        self.lines: list[str] = []
+        self.tokens = 0
+        self._skip_depth = 0
+        self._current: Optional[tuple[str, str]] = None
+        self._text: list[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth += 1
+            return
+        if self._skip_depth:
+            return
+
+        attr_map = dict(attrs)
+        if tag not in _OUTLINE_TAGS and "role" not in attr_map and "aria-label" not in attr_map:
+            return
+
+        self._flush()
+        kept = " ".join(
+            k if v is None else f'{k}="{v[:80]}"'
+            for k, v in attrs
+            if k in _OUTLINE_ATTRS or k.startswith("aria-")
+        )
+        self._current = (tag, f"<{tag} {kept}>" if kept else f"<{tag}>")
+        if tag in _OUTLINE_VOID_TAGS:
+            self._flush()
+
+    def handle_endtag(self, tag):
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth = max(self._skip_depth - 1, 0)
+        elif self._current is not None and self._current[0] == tag:
+            self._flush()
+
+    def handle_data(self, data):
+        if self._current is not None and not self._skip_depth:
+            self._text.append(data)
+
+    def _flush(self) -> None:
+        if self._current is None:
+            return
+        text = " ".join(" ".join(self._text).split())[:120]
+        line = self._current[1] + text
+        self._current = None
+        self._text = []
+        line_tokens = _estimate_tokens(line) + 1
+        if self.tokens + line_tokens > self.max_tokens:
+            raise _OutlineFull
+        self.lines.append(line)
+        self.tokens += line_tokens
+
+
+def _summarize_html(html: str, max_tokens: int = HTML_TOKEN_BUDGET) -> tuple[str, bool]:
+    """Reduce a page to an outline of its accessibility-relevant elements.
+
+    Returns:
+        The outline and whether it was cut short at ``max_tokens`` (estimated).
+        Falls back to the leading ``max_tokens`` of ``html`` when nothing
+        relevant is found.
+    """
+    parser = _HTMLOutline(max_tokens)
+    truncated = False
+    try:
+        parser.feed(html)
+        parser.close()
+        parser._flush()
+    except _OutlineFull:
+        truncated = True
+
+    if not parser.lines:
+        return _truncate_to_tokens(html, max_tokens)
+    return "\n".join(parser.lines), truncated
+
+
+# ---------------------------------------------------------------------------
+# Prompt templates (static text; only the placeholders change per call).
+# Placeholders sit at the end so the instructions form a stable prefix.
+# ---------------------------------------------------------------------------
+
+_SYSTEM_INSTRUCTION = """\
+You are an expert in web accessibility, inclusive design, and ethical UX.
+
+Role:
+- Identify barriers that prevent users from accessing or understanding content.
+- Recommend specific, actionable improvements to meet WCAG 2.1 guidelines.
+- Promote ethical and inclusive decision-making in product design.
+
+Expectations:
+- Reference WCAG criteria when applicable.
+- Use clear and direct language.
+- Avoid vague or generic advice.
+- Focus on practical steps that design and engineering teams can implement.
+
+Your output should:
+- Diagnose the issue concisely.
+- Explain why it matters for users.
+- Provide a clear, actionable fix.
+
+Goal:
+Help teams build accessible, inclusive, and ethical digital products that work for everyone.
+"""
+
+_COMPREHENSIVE_ROLE_BLOCK = """\
+You are a specialist UX auditor focusing on accessibility, visual design, and ethical user experience.
+
+Given a website (via screenshot, HTML structure, and automated audit metrics), deliver a detailed and structured audit covering:
+
+1. Accessibility & WCAG Compliance
+- Evaluate against WCAG 2.1 (Level A/AA/AAA as applicable).
+- Verify full keyboard accessibility.
+- Check screen-reader compatibility: semantic HTML, ARIA roles, labels.
+- Confirm visual accessibility: contrast ratio, text size, zoom/scaling behavior.
+- Verify alternative text for images/icons and captions/transcripts for media.
+- Ensure logical focus order and visible focus indicators.
+- Avoid conveying meaning using color alone.
+- Flag barriers that prevent users with disabilities from completing tasks.
+
+2. Visual Design & Contrast
+- Evaluate typography: size, line height, readability.
+- Check colour contrast (minimum 4.5:1 for body text per WCAG).
+- Review layout consistency, spacing, alignment, visual hierarchy.
+- Verify responsive behavior across breakpoints.
+- Identify unnecessary animations or visual noise.
+- Check brand/design consistency: buttons, icons, spacing, padding.
+- Assess clarity and visibility of calls-to-action.
+
+3. Ethical UX & Dark Patterns
+- Detect manipulative UI patterns: forced sign-ups, misleading defaults, urgency pressure.
+- Evaluate transparency for pricing and data collection.
+- Confirm respect for user agency: undo options, cancellation clarity, clear exits.
+- Assess privacy/accessibility fairness and ensure no coercive UI behaviors.
+
+4. Prioritized Recommendations
+For each issue identified:
+- Specify actionable recommendation.
+- Assign priority: High / Medium / Low.
+- Explain user impact and risk.
+- Provide quick wins and longer-term fixes.
+
+5. Overall Summary
+- Provide an executive summary with key strengths and critical issues.
+- Suggest a roadmap: example → fix accessibility blockers → refine visual hierarchy → re-check ethical UX patterns.
+"""
+
+_COMPREHENSIVE_REQUEST_BLOCK = """\
+You are a specialist UX auditor focusing on accessibility, visual design, and ethical user experience.
+
+Using the screenshot, HTML structure, and automated audit metrics, produce a structured UX audit.
+
+Deliver the report with the following sections:
+
+## 1. Executive Summary
+- State overall UX and accessibility quality.
+- Identify key findings and critical usability or accessibility issues.
+
+## 2. Accessibility Analysis (WCAG aligned)
+- Identify clear accessibility barriers.
+- Map each issue to relevant WCAG 2.1 guideline (A/AA/AAA).
+- Evaluate keyboard-only navigation, screen reader semantics, ARIA roles, alt text, focus order, contrast, and color reliance.
+- Explain how these issues affect users with disabilities.
+
+## 3. Visual Design & Contrast
+- Check contrast ratios and text readability.
+- Evaluate typography: hierarchy, font size, spacing.
+- Assess layout, alignment, responsiveness, visual noise, and clarity of CTAs.
+
+## 4. Ethical UX & Dark Patterns
+- Identify manipulative UI patterns:
+- Hidden opt-outs
+- Forced sign-ups
+- Misleading language or urgency pressure
+- Evaluate transparency in data handling and user autonomy.
+
+## 5. Prioritized Recommendations
+For every issue:
+- Actionable fix
+- Priority level (High / Medium / Low)
+- User impact explanation
+- Quick wins vs long-term fixes
+
+## 6. Implementation Guidance
+- Code-level suggestions (HTML, ARIA, CSS changes).
+- Design guidance for improving clarity, fairness, and accessibility.
+- Testing strategy:
+- Keyboard navigation test
+- Screen reader test (NVDA/VoiceOver)
+- Contrast test using tooling
+"""
+
+# Both comprehensive blocks are sent ahead of any per-page content so that
+# every request shares the same prefix.
+_STATIC_RUBRIC = _COMPREHENSIVE_ROLE_BLOCK + "\n" + _COMPREHENSIVE_REQUEST_BLOCK
+
+_ACCESSIBILITY_TEMPLATE = """\
+You are an accessibility specialist performing a WCAG 2.1 audit.
+
+Produce a structured audit that includes:
+
+1. Executive Summary
+- Short evaluation of overall accessibility health.
+- Describe risk level and blockers that prevent task completion.
+
+2. Top 3 Critical Issues
+For each issue:
+- Identify the WCAG criterion (A / AA / AAA).
+- State the direct usability impact.
+- Explain the functional barrier created.
+
+3. Actionable Recommendations
+For each issue:
+- Exact fix (what code or design change is required).
+- Include examples (e.g., proper ARIA, alt text, label association, color contrast values).
+- Prioritize high-impact, low-effort changes first.
+
+4. Users Affected
+- Identify which user groups are impacted (screen reader users, keyboard-only users, users with low vision, cognitive load sensitivity).
+- Explain how the barrier prevents or slows task completion.
+
+Output requirements:
+- Clear and concise.
+- No generic phrasing; reference the violations explicitly.
+- Focus on improving access without assigning blame.
+
+Inputs:
+- Accessibility Score: {score:.2%}
+- Number of Violations: {count}
+- Detailed Violations (id|impact|description):
+{violations_text}
+"""
+
+_CONTRAST_TEMPLATE = """\
+You are a visual design and accessibility specialist evaluating contrast compliance (WCAG 2.1).
+
+Produce a structured assessment:
+
+1. Readability Evaluation
+- Assess overall visual clarity and text readability.
+- Compare the average contrast ratio against WCAG thresholds.
+- Identify if contrast affects primary content, navigation, or interactive elements.
+
+2. Impact on Users
+- Explain how low contrast affects users with low vision, color-vision deficiencies, and users in high-glare environments.
+- State whether users may miss information or fail to identify interactive elements.
+
+3. Practical Color Palette Recommendations
+- Suggest specific color adjustments that meet WCAG AA contrast (e.g., increase text darkness, darken background, adjust brand palette).
+- Provide example contrast-safe combinations with hex values when applicable.
+
+4. Priority Fixes
+- Rank fixes from highest to lowest impact (e.g., primary text, navigation, buttons/CTAs, secondary UI elements).
+- Focus on high-frequency tasks and critical actions.
+
+Output requirements:
+- Concise, practical, design-friendly.
+- No generic advice. Reference specific violations and contrast values.
+
+Inputs:
+- Average Contrast Ratio: {avg_contrast:.2f}:1
+- WCAG AA requirements: 4.5:1 for normal text, 3:1 for large text
+- Low-contrast regions detected: {count}
+- Violations detected (contrast ratio|x,y,width,height):
+{violations_text}
+"""
+
+_DARK_PATTERN_TEMPLATE = """\
+You are a UX ethics specialist evaluating potentially manipulative design patterns (dark patterns).
+
+Your task:
+Produce a structured and professional audit focused on transparency, fairness, and user trust.
+
+Required Output:
+
+1. Ethical Risk Assessment
+- Identify the ethical issues in the detected patterns.
+- State whether the design restricts user autonomy, hides information, or pressures a choice.
+
+2. How the Patterns Manipulate Users
+- Explain the psychological or behavioral mechanism involved (e.g., confirmshaming, misdirection, forced action).
+- Describe the user’s likely mental model and how the interface exploits it.
+
+3. Ethical Alternatives (Actionable)
+- Provide specific UI/UX improvements to make the design ethical and transparent.
+- Examples:
+- Replace manipulative microcopy with neutral wording.
+- Make opt-out options visible and equal in visual hierarchy.
+- Present choices without time pressure or emotional guilt.
+
+4. Trust & Brand Reputation Impact
+- Explain how manipulative patterns reduce long-term trust and create negative sentiment.
+- Clarify how ethical design increases loyalty, retention, and conversion quality.
+
+Output Style Requirements:
+- Constructive, actionable, and user-centric.
+- No blaming; focus on improvement and creating trust.
+
+Inputs Provided:
+- Ethical UX Score: {score:.2%}
+- Count of Flagged Patterns: {count}
+- Detected Patterns (label|confidence|text):
+{patterns_text}
+"""
+
+_RECOMMENDATIONS_TEMPLATE = """\
+You are a product design consultant. Use the audit data to create a strategic improvement plan.
+
+Output Requirements:
+
+1. Prioritized Action Plan
+- Quick Wins (high impact, low effort)
+- Medium-term Improvements
+- Long-term Enhancements
+- Each item must include what to change and why it matters.
+
+2. Resource Allocation
+- Recommend how design, engineering, and accessibility resources should be distributed.
+- Call out dependencies and sequence.
+
+3. Implementation Timeline
+- Provide grouped estimates (e.g., 1–2 weeks, 1 month, 1+ quarter).
+- Prioritize accessibility blockers and ethical issues first.
+
+4. Success Metrics
+- Define measurable outcomes (reduction in violations, improved conversion without dark patterns, fewer support tickets).
+
+5. Team Roles Needed
+- Specify the roles required (designer, frontend developer, accessibility specialist, QA).
+- Clarify what each role is responsible for.
+
+Constraints:
+- Advice must be practical and execution-focused.
+- Use concise language. No filler text.
+
+Inputs:
+- Overall Design Fairness Score: {fairness_score:.2f}/1.0
+- Accessibility Score: {accessibility_score}
+- Average Contrast Ratio: {contrast_ratio:.2f}:1
+- Ethical UX Score: {ethics_score:.2%}
+
+Key Issues Identified:
+- {accessibility_count} accessibility violations
+- {contrast_count} contrast issues
+- {dark_pattern_count} potential dark patterns
+"""
+
+_VALIDATION_PROMPT = """\
+You are an independent UX fairness auditor. Review the provided website evidence
+(screenshot plus heuristics) and validate two things:
+
+1. Ethical UX / Potential Dark Patterns
+   - Identify only genuine manipulative patterns.
+   - Prefer precision over recall; ignore benign persuasive design.
+   - For each confirmed pattern, provide label, severity (none/low/medium/high),
+     confidence (0.0-1.0) and an explanation users understand.
+   - Suggest a clear recommendation to fix the pattern.
+   - Compute an overall score in [0, 1] where 1.0 means no concerning patterns.
+
+2. Visual Contrast & Legibility
+   - Focus on real text contrast or readability issues.
+   - Ignore decorative elements or acceptable gradients.
+   - For confirmed contrast issues, state area, severity (low/medium/high),
+     estimated contrast ratio if visible, and actionable recommendation.
+   - Provide an overall score in [0, 1] where 1.0 means excellent contrast.
+
+Respond with strict JSON matching:
+
+{
+  "dark_patterns": {
+    "overall_score": float,
+    "patterns": [
+      {
+        "label": string,
+        "severity": "none" | "low" | "medium" | "high",
+        "confidence": float,
+        "explanation": string,
+        "recommendation": string
+      }
+    ]
+  },
+  "contrast": {
+    "overall_score": float,
+    "issues": [
+      {
+        "area": string,
+        "severity": "low" | "medium" | "high",
+        "contrast_ratio_estimate": float | null,
+        "explanation": string,
+        "recommendation": string
+      }
+    ]
+  }
+}
+
+Do not emit any text outside the JSON object.
+"""
+
+_BATCH_INSTRUCTIONS = """\
+Complete each of the independent tasks below. Respond with a single JSON object
+whose keys are the task names ({names}) and whose values are the complete
+Markdown answer to that task, as a string. Do not emit any text outside the
+JSON object.
+"""
+
+# Row formatters for the per-section prompts. Rows are pipe-separated with
+# the column names given once in the template, which costs far fewer tokens
+# than repeating "key: value" labels on every row.
+
+def _prompt_field(value, limit: int) -> str:
+    return " ".join(str(value).split()).replace("|", "/")[:limit]
+
+
+def _fmt_axe_violation(v: dict) -> str:
+    violation_id = v.get("violation_id") or v.get("id") or "unknown"
+    description = _prompt_field(v.get("description") or "No description", 200)
+    return f"{violation_id}|{v.get('impact') or 'unknown'}|{description}"
+
+
+def _fmt_contrast_violation(v: dict) -> str:
+    ratio = v.get("contrast_ratio", v.get("ratio", 0))
+    bbox = v.get("bbox")
+    position = ",".join(str(c) for c in bbox) if isinstance(bbox, (list, tuple)) else "unknown"
+    return f"{ratio:.2f}|{position}"
+
+
+def _fmt_dark_pattern(f: dict) -> str:
+    return f"{f.get('label', 'Unknown')}|{f.get('score', 0):.0%}|{_prompt_field(f.get('text', ''), 150)}"
+
+
+def _prompt_rows(items: Iterable[dict], formatter, limit: int) -> str:
+    """Format up to ``limit`` distinct rows, stopping early at ``ROWS_TOKEN_BUDGET``.
+
+    Repeated rows (e.g. the same flagged text at several places on the
+    page) are listed once, with a count of the omitted repeats.
+    """
+    rows: list[str] = []
+    seen: set[str] = set()
+    repeats = used = 0
+    for item in items:
+        row = formatter(item)
+        if row in seen:
+            repeats += 1
+            continue
+        cost = _estimate_tokens(row)
+        if len(rows) == limit or (rows and used + cost > ROWS_TOKEN_BUDGET):
+            break
+        seen.add(row)
+        rows.append(row)
+        used += cost
+    if repeats:
+        rows.append(f"(+{repeats} repeats of the rows above)")
+    return "\n".join(rows)
 
 
 @dataclass
@@ -22,11 +732,73 @@ class LLMConfig:
     temperature: float = 0.7
     max_tokens: int = 8000
     custom_prompt_template: Optional[str] = None
+    response_cache: Optional[bool] = None
+    response_cache_ttl_hours: float = 24.0
+    cache_db_path: Optional[str] = None
+    warm_up: bool = True
+    batch_sections: bool = False
+    max_retries: int = 3
+    max_concurrency: int = 8
+    section_max_tokens: bool = False
+    transport: Optional[str] = None
+    cache_enabled: bool = True
+    memory_cache_size: int = 512
+    semantic_cache: bool = False
+    semantic_cache_threshold: float = 0.92
+    semantic_cache_model: str = "sentence-transformers/all-MiniLM-L6-v2"
     
     def __post_init__(self):
-        """Load API key from environment if not provided."""
+        """Load API key and response-cache settings from environment if not provided."""
         if self.api_key is None:
             self.api_key = os.getenv("GOOGLE_API_KEY")
+        if self.cache_db_path is None:
+            self.cache_db_path = os.getenv("DA_LLM_CACHE_DB") or None
+        if self.response_cache is None:
+            self.response_cache = bool(self.cache_db_path) or (
+                os.getenv("DA_LLM_CACHE", "").lower() in {"1", "true", "yes"}
+            )
+
+
+_BACKGROUND_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_BACKGROUND_LOOP_LOCK = threading.Lock()
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    """Return the event loop that hosts every async Gemini call in the process."""
+    global _BACKGROUND_LOOP
+    with _BACKGROUND_LOOP_LOCK:
+        if _BACKGROUND_LOOP is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="gemini-async", daemon=True).start()
+            _BACKGROUND_LOOP = loop
+        return _BACKGROUND_LOOP
+
+
+# Analyzers shared by the pipeline and the report writers, keyed by config
+_ANALYZER_CACHE: dict[tuple, "LLMAnalyzer"] = {}
+_ANALYZER_LOCK = threading.Lock()
+
+
+def get_llm_analyzer(config: LLMConfig) -> "LLMAnalyzer":
+    """Return the process-wide analyzer for ``config``, creating it on first use.
+
+    Reusing one analyzer keeps its Gemini model, warm connections and
+    response caches across audits; prefer this over constructing
+    :class:`LLMAnalyzer` directly. A newly shared analyzer is warmed up in
+    the background when ``config.warm_up`` is set.
+    """
+    key = dataclasses.astuple(config)
+    with _ANALYZER_LOCK:
+        analyzer = _ANALYZER_CACHE.get(key)
+        if analyzer is None:
+            analyzer = LLMAnalyzer(config)
+            if not analyzer.is_available():
+                # Not cached so a later call can retry once the key or SDK is present
+                return analyzer
+            _ANALYZER_CACHE[key] = analyzer
+            if config.warm_up:
+                analyzer.warm_up()
+        return analyzer
 
 
 class LLMAnalyzer:
@@ -40,28 +812,327 @@ class LLMAnalyzer:
         """
         self.config = config or LLMConfig()
         self._model = None
-        
-        print(f"DEBUG INIT: genai module available: {genai is not None}")
-        print(f"DEBUG INIT: API key present: {self.config.api_key is not None}")
-        print(f"DEBUG INIT: API key value (first 10 chars): {self.config.api_key[:10] if self.config.api_key else 'None'}")
-        print(f"DEBUG INIT: Model: {self.config.model}")
-        
-        if genai is not None and self.config.api_key:
-            try:
-                genai.configure(api_key=self.config.api_key)
-                self._model = genai.GenerativeModel(self.config.model)
-                print(f"DEBUG INIT: Model initialized successfully")
-            except Exception as e:
-                print(f"DEBUG INIT: Failed to initialize model: {e}")
-        else:
-            if genai is None:
-                print(f"DEBUG INIT: genai module not available - install google-generativeai")
-            if not self.config.api_key:
-                print(f"DEBUG INIT: No API key provided")
+        self._model_lock = threading.Lock()
+        self._model_loaded = False
+        # Same model with _SYSTEM_INSTRUCTION as its system instruction, used
+        # by the per-section analyses; None on SDKs without system_instruction
+        self._section_model = None
+        # In-process LRU of responses, consulted before the on-disk cache
+        self._response_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._response_cache_lock = threading.Lock()
+        self._cache_db: Optional[sqlite3.Connection] = None
+        # Prompt embeddings (unit rows) and responses for the semantic cache
+        self._semantic_embeddings = np.empty((0, 0), dtype=np.float32)
+        self._semantic_responses: list[str] = []
+        if self.config.response_cache and self.config.cache_db_path:
+            self._cache_db = self._open_cache_db(self.config.cache_db_path)
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+        # Generation parameters are fixed per analyzer; the strict variant
+        # backs the JSON validation pass.
+        self._gen_cfg = {
+            "temperature": self.config.temperature,
+            "max_output_tokens": self.config.max_tokens,
+        }
+        self._gen_cfg_strict = {
+            "temperature": min(self.config.temperature, 0.3),
+            "max_output_tokens": min(self.config.max_tokens, 4000),
+        }
+        self._section_gen_cfg = {
+            name: (
+                {**self._gen_cfg, "max_output_tokens": min(limit, self.config.max_tokens)}
+                if self.config.section_max_tokens
+                else self._gen_cfg
+            )
+            for name, limit in SECTION_MAX_TOKENS.items()
+        }
+        # Prompt templates resolved once; a custom template replaces all four
+        custom_template = self.config.custom_prompt_template
+        self._accessibility_tpl = custom_template or _ACCESSIBILITY_TEMPLATE
+        self._contrast_tpl = custom_template or _CONTRAST_TEMPLATE
+        self._dark_pattern_tpl = custom_template or _DARK_PATTERN_TEMPLATE
+        self._recommendations_tpl = custom_template or _RECOMMENDATIONS_TEMPLATE
+    
+    def _ensure_model(self) -> None:
+        """Import the SDK and build the Gemini models, once."""
+        if self._model_loaded:
+            return
+        with self._model_lock:
+            if self._model_loaded:
+                return
+            genai = _genai()
+            if genai is not None and self.config.api_key:
+                try:
+                    # The SDK's default gRPC transport keeps one HTTP/2 channel
+                    # per client; "rest" is only for networks that block gRPC.
+                    transport = {"transport": self.config.transport} if self.config.transport else {}
+                    genai.configure(api_key=self.config.api_key, **transport)
+                    self._model = genai.GenerativeModel(self.config.model)
+                    try:
+                        self._section_model = genai.GenerativeModel(
+                            self.config.model, system_instruction=_SYSTEM_INSTRUCTION
+                        )
+                    except TypeError:  # google-generativeai < 0.5
+                        logger.debug("SDK has no system_instruction; inlining the system prompt")
+                    logger.debug("Initialized Gemini model %s", self.config.model)
+                except Exception as e:
+                    logger.warning("Failed to initialize Gemini model %s: %s", self.config.model, e)
+            else:
+                if genai is None:
+                    logger.debug("genai module not available - install google-generativeai")
+                if not self.config.api_key:
+                    logger.debug("No Gemini API key provided")
+            self._model_loaded = True
     
     def is_available(self) -> bool:
-        """Check if LLM is available for use."""
+        """Check if LLM is available for use (loads the SDK on first call)."""
+        self._ensure_model()
         return self._model is not None
+
+    def warm_up(self) -> None:
+        """Load the SDK and open the Gemini connections in the background.
+
+        Issues a free ``count_tokens`` request on both the sync and the async
+        transport so the import and the TLS/HTTP2 handshakes overlap with
+        page collection instead of delaying the first analysis. Failures are
+        ignored.
+        """
+
+        async def aping() -> None:
+            try:
+                await self._model.count_tokens_async("ping")
+            except Exception as exc:
+                logger.debug("Gemini async warm-up failed: %s", exc)
+
+        def ping() -> None:
+            if not self.is_available():
+                return
+            if hasattr(self._model, "count_tokens_async"):
+                asyncio.run_coroutine_threadsafe(aping(), _background_loop())
+            try:
+                self._model.count_tokens("ping")
+            except Exception as exc:
+                logger.debug("Gemini warm-up failed: %s", exc)
+
+        threading.Thread(target=ping, name="gemini-warm-up", daemon=True).start()
+
+    def _backoff(self, attempt: int, exc: Exception) -> float:
+        """Full-jitter exponential delay before retry ``attempt + 1``."""
+        delay = random.uniform(0, min(20.0, 2.0 ** attempt))
+        logger.debug("Transient Gemini error (attempt %d), retrying in %.1fs: %s", attempt + 1, delay, exc)
+        return delay
+
+    def _generate(
+        self,
+        content,
+        generation_config: dict,
+        stream: bool = False,
+        model=None,
+    ):
+        """Send ``content`` to ``model`` (the default model when None).
+
+        Rate-limit and availability errors are retried up to
+        ``config.max_retries`` times; anything else propagates.
+        """
+        for attempt in range(self.config.max_retries + 1):
+            try:
+                return (model or self._model).generate_content(
+                    content, generation_config=generation_config, stream=stream
+                )
+            except Exception as exc:
+                if attempt == self.config.max_retries or not _is_transient(exc):
+                    raise
+                time.sleep(self._backoff(attempt, exc))
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        """Per-event-loop limit on in-flight async requests."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.config.max_concurrency)
+        return semaphore
+
+    async def _agenerate(
+        self,
+        content,
+        generation_config: dict,
+        model=None,
+    ):
+        """Async counterpart of :meth:`_generate`, capped at ``config.max_concurrency``."""
+        for attempt in range(self.config.max_retries + 1):
+            try:
+                async with self._semaphore():
+                    return await (model or self._model).generate_content_async(
+                        content, generation_config=generation_config
+                    )
+            except Exception as exc:
+                if attempt == self.config.max_retries or not _is_transient(exc):
+                    raise
+                await asyncio.sleep(self._backoff(attempt, exc))
+
+    def _response_key(self, content, generation_config: dict) -> Optional[str]:
+        """Key for the response caches, or ``None`` when both are disabled.
+
+        ``content`` is the full request, static preamble included, so that
+        edits to the static prompts invalidate earlier responses.
+        """
+        if not (self.config.cache_enabled or self.config.response_cache):
+            return None
+
+        # xxh3 is several times faster than BLAKE2 on large prompts and
+        # screenshots; the keys only need to be stable, not unforgeable.
+        digest = xxhash.xxh3_128() if xxhash is not None else hashlib.blake2b(digest_size=20)
+        digest.update(f"{self.config.model}|{sorted(generation_config.items())}".encode("utf-8"))
+        for part in content if isinstance(content, list) else [content]:
+            if isinstance(part, str):
+                digest.update(b"\0s")
+                digest.update(part.encode("utf-8"))
+            elif isinstance(part, dict):
+                digest.update(b"\0b")
+                digest.update(part["data"])
+            else:
+                digest.update(b"\0i")
+                filename = getattr(part, "filename", "")
+                if filename and os.path.exists(filename):
+                    with open(filename, "rb") as handle:
+                        digest.update(handle.read())
+                else:
+                    digest.update(part.tobytes())
+        return digest.hexdigest()
+
+    def _cached_response(self, key: Optional[str]) -> Optional[str]:
+        """Return a stored response for ``key`` if it has not expired."""
+        if key is None:
+            return None
+        if self.config.cache_enabled:
+            with self._response_cache_lock:
+                text = self._response_cache.get(key)
+                if text is not None:
+                    self._response_cache.move_to_end(key)
+                    return text
+        if not self.config.response_cache:
+            return None
+        max_age = self.config.response_cache_ttl_hours * 3600
+        if self._cache_db is not None:
+            try:
+                with self._response_cache_lock:
+                    row = self._cache_db.execute(
+                        "SELECT response FROM llm_cache WHERE key = ? AND ts >= ?",
+                        (bytes.fromhex(key), int(time.time() - max_age)),
+                    ).fetchone()
+            except sqlite3.Error as exc:
+                logger.debug("Could not read response cache database: %s", exc)
+                return None
+            if row is None:
+                return None
+            text = row[0]
+        else:
+            path = LLM_CACHE_DIR / f"{key}.txt"
+            try:
+                if time.time() - path.stat().st_mtime > max_age:
+                    return None
+                text = path.read_text(encoding="utf-8")
+            except OSError:
+                return None
+        self._remember_response(key, text)
+        return text
+
+    def _open_cache_db(self, path: str) -> Optional[sqlite3.Connection]:
+        """Open the SQLite response cache, dropping rows past the TTL.
+
+        Returns ``None`` (falling back to the cache directory) when the
+        database cannot be opened.
+        """
+        try:
+            Path(path).expanduser().parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(Path(path).expanduser(), check_same_thread=False)
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS llm_cache "
+                    "(key BLOB PRIMARY KEY, response TEXT, ts INTEGER)"
+                )
+                conn.execute(
+                    "DELETE FROM llm_cache WHERE ts < ?",
+                    (int(time.time() - self.config.response_cache_ttl_hours * 3600),),
+                )
+        except (OSError, sqlite3.Error) as exc:
+            logger.warning("Could not open response cache database %s: %s", path, exc)
+            return None
+        return conn
+
+    def _semantic_lookup(self, prompt: str) -> tuple[Optional[str], Optional[np.ndarray]]:
+        """Find a stored response for a prompt that is nearly identical to ``prompt``.
+
+        Returns the response (or ``None``) and the prompt embedding to pass to
+        :meth:`_semantic_store` on a miss.
+        """
+        if not self.config.semantic_cache:
+            return None, None
+        encoder = _sentence_encoder(self.config.semantic_cache_model)
+        if encoder is None:
+            return None, None
+        embedding = np.asarray(
+            encoder.encode(prompt, normalize_embeddings=True), dtype=np.float32
+        )
+        with self._response_cache_lock:
+            if self._semantic_responses:
+                similarities = self._semantic_embeddings @ embedding
+                best = int(similarities.argmax())
+                if similarities[best] >= self.config.semantic_cache_threshold:
+                    return self._semantic_responses[best], embedding
+        return None, embedding
+
+    def _semantic_store(self, embedding: Optional[np.ndarray], text: str) -> None:
+        """Record ``text`` for later near-duplicate prompts (bounded like the LRU)."""
+        if embedding is None or not text:
+            return
+        with self._response_cache_lock:
+            if self._semantic_responses:
+                self._semantic_embeddings = np.vstack([self._semantic_embeddings, embedding])
+            else:
+                self._semantic_embeddings = embedding[np.newaxis, :]
+            self._semantic_responses.append(text)
+            overflow = len(self._semantic_responses) - max(self.config.memory_cache_size, 1)
+            if overflow > 0:
+                self._semantic_embeddings = self._semantic_embeddings[overflow:]
+                del self._semantic_responses[:overflow]
+
+    def _remember_response(self, key: str, text: str) -> None:
+        """Add ``text`` to the in-process LRU, evicting the oldest entries."""
+        if not self.config.cache_enabled:
+            return
+        with self._response_cache_lock:
+            self._response_cache[key] = text
+            self._response_cache.move_to_end(key)
+            while len(self._response_cache) > max(self.config.memory_cache_size, 0):
+                self._response_cache.popitem(last=False)
+
+    def _store_response(self, key: Optional[str], text: str) -> None:
+        """Persist ``text`` under ``key``; failures only cost the cache entry."""
+        if key is None or not text:
+            return
+        self._remember_response(key, text)
+        if not self.config.response_cache:
+            return
+        if self._cache_db is not None:
+            try:
+                with self._response_cache_lock, self._cache_db:
+                    self._cache_db.execute(
+                        "INSERT OR REPLACE INTO llm_cache (key, response, ts) VALUES (?, ?, ?)",
+                        (bytes.fromhex(key), text, int(time.time())),
+                    )
+            except sqlite3.Error as exc:
+                logger.debug("Could not write response cache entry: %s", exc)
+            return
+        path = LLM_CACHE_DIR / f"{key}.txt"
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            LLM_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(text, encoding="utf-8")
+            os.replace(tmp_path, path)
+        except OSError as exc:
+            logger.debug("Could not write response cache entry: %s", exc)
     
     def analyze_comprehensive(
         self,
@@ -75,6 +1146,9 @@ class LLMAnalyzer:
     ) -> str:
         """Perform comprehensive multimodal analysis using screenshot and HTML.
         
+        Collects the output of :meth:`stream_comprehensive`; use that directly
+        to show the analysis while it is being generated.
+        
         Args:
             screenshot_path: Path to screenshot image
             html_content: Raw HTML content
@@ -87,67 +1161,49 @@ class LLMAnalyzer:
         Returns:
             Comprehensive LLM-generated analysis
         """
+        response = "".join(self.stream_comprehensive(
+            screenshot_path=screenshot_path,
+            html_content=html_content,
+            url=url,
+            accessibility_data=accessibility_data,
+            contrast_data=contrast_data,
+            dark_pattern_data=dark_pattern_data,
+            custom_prompt=custom_prompt,
+        )).strip()
+        logger.debug("Comprehensive analysis received, length: %d", len(response))
+        return response
+    
+    def stream_comprehensive(
+        self,
+        screenshot_path: Optional[str] = None,
+        html_content: Optional[str] = None,
+        url: Optional[str] = None,
+        accessibility_data: Optional[dict] = None,
+        contrast_data: Optional[dict] = None,
+        dark_pattern_data: Optional[dict] = None,
+        custom_prompt: Optional[str] = None
+    ) -> Iterator[str]:
+        """Stream the comprehensive analysis as it is generated.
+        
+        Takes the same arguments as :meth:`analyze_comprehensive`.
+        
+        Yields:
+            Text chunks of the LLM response (or a single error message)
+        """
         if not self.is_available():
-            print("DEBUG LLM: LLM not available")
-            return ""
+            logger.debug("LLM not available")
+            return
         
-        print(f"DEBUG LLM: Starting comprehensive analysis")
-        print(f"DEBUG LLM: Screenshot path: {screenshot_path}")
-        print(f"DEBUG LLM: Has HTML: {html_content is not None}")
+        logger.debug(
+            "Starting comprehensive analysis (screenshot=%s, html=%s)",
+            screenshot_path, html_content is not None,
+        )
         
         try:
-            from PIL import Image as PILImage
-            print(f"DEBUG LLM: PIL.Image imported successfully")
-            
-            # Build comprehensive prompt
+            # Build the per-page part of the prompt; the static rubric is
+            # sent ahead of it below.
             prompt_parts = []
             
-            # Add system instruction
-            prompt_parts.append(
-            """
-                You are a specialist UX auditor focusing on accessibility, visual design, and ethical user experience.
-
-                Given a website (via screenshot, HTML structure, and automated audit metrics), deliver a detailed and structured audit covering:
-
-                1. Accessibility & WCAG Compliance
-                - Evaluate against WCAG 2.1 (Level A/AA/AAA as applicable).
-                - Verify full keyboard accessibility.
-                - Check screen-reader compatibility: semantic HTML, ARIA roles, labels.
-                - Confirm visual accessibility: contrast ratio, text size, zoom/scaling behavior.
-                - Verify alternative text for images/icons and captions/transcripts for media.
-                - Ensure logical focus order and visible focus indicators.
-                - Avoid conveying meaning using color alone.
-                - Flag barriers that prevent users with disabilities from completing tasks.
-
-                2. Visual Design & Contrast
-                - Evaluate typography: size, line height, readability.
-                - Check colour contrast (minimum 4.5:1 for body text per WCAG).
-                - Review layout consistency, spacing, alignment, visual hierarchy.
-                - Verify responsive behavior across breakpoints.
-                - Identify unnecessary animations or visual noise.
-                - Check brand/design consistency: buttons, icons, spacing, padding.
-                - Assess clarity and visibility of calls-to-action.
-
-                3. Ethical UX & Dark Patterns
-                - Detect manipulative UI patterns: forced sign-ups, misleading defaults, urgency pressure.
-                - Evaluate transparency for pricing and data collection.
-                - Confirm respect for user agency: undo options, cancellation clarity, clear exits.
-                - Assess privacy/accessibility fairness and ensure no coercive UI behaviors.
-
-                4. Prioritized Recommendations
-                For each issue identified:
-                - Specify actionable recommendation.
-                - Assign priority: High / Medium / Low.
-                - Explain user impact and risk.
-                - Provide quick wins and longer-term fixes.
-
-                5. Overall Summary
-                - Provide an executive summary with key strengths and critical issues.
-                - Suggest a roadmap: example → fix accessibility blockers → refine visual hierarchy → re-check ethical UX patterns.
-            """
-            )
-
-            
             # Add context
             if url:
                 prompt_parts.append(f"\n## Website URL\n{url}\n")
@@ -175,109 +1231,52 @@ class LLMAnalyzer:
 - Detected Patterns: {dark_pattern_data.get('pattern_count', 0)}
 """)
             
-            # Add HTML structure (truncated if too long)
+            # Add HTML structure (outline of the elements the rubric covers)
             if html_content:
-                html_truncated = html_content[:15000] if len(html_content) > 15000 else html_content
+                html_outline, truncated = _summarize_html(html_content)
                 prompt_parts.append(f"""
 ## HTML Structure
+Landmarks, headings, links, images, form controls and ARIA-labelled elements, in document order:
 ```html
-{html_truncated}
+{html_outline}
 ```
-{"(HTML truncated to first 15,000 characters)" if len(html_content) > 15000 else ""}
-""")            
-            # Add analysis request
-            prompt_parts.append(
-                """
-                You are a specialist UX auditor focusing on accessibility, visual design, and ethical user experience.
-
-                Using the screenshot, HTML structure, and automated audit metrics, produce a structured UX audit.
-
-                Deliver the report with the following sections:
-
-                ## 1. Executive Summary
-                - State overall UX and accessibility quality.
-                - Identify key findings and critical usability or accessibility issues.
-
-                ## 2. Accessibility Analysis (WCAG aligned)
-                - Identify clear accessibility barriers.
-                - Map each issue to relevant WCAG 2.1 guideline (A/AA/AAA).
-                - Evaluate keyboard-only navigation, screen reader semantics, ARIA roles, alt text, focus order, contrast, and color reliance.
-                - Explain how these issues affect users with disabilities.
-
-                ## 3. Visual Design & Contrast
-                - Check contrast ratios and text readability.
-                - Evaluate typography: hierarchy, font size, spacing.
-                - Assess layout, alignment, responsiveness, visual noise, and clarity of CTAs.
-
-                ## 4. Ethical UX & Dark Patterns
-                - Identify manipulative UI patterns:
-                - Hidden opt-outs
-                - Forced sign-ups
-                - Misleading language or urgency pressure
-                - Evaluate transparency in data handling and user autonomy.
-
-                ## 5. Prioritized Recommendations
-                For every issue:
-                - Actionable fix
-                - Priority level (High / Medium / Low)
-                - User impact explanation
-                - Quick wins vs long-term fixes
-
-                ## 6. Implementation Guidance
-                - Code-level suggestions (HTML, ARIA, CSS changes).
-                - Design guidance for improving clarity, fairness, and accessibility.
-                - Testing strategy:
-                - Keyboard navigation test
-                - Screen reader test (NVDA/VoiceOver)
-                - Contrast test using tooling
-                """
-            )
-
-            
-            # Combine prompt
-            full_prompt = "".join(prompt_parts)
+{f"(Outline truncated to about {HTML_TOKEN_BUDGET:,} tokens)" if truncated else ""}
+""")
+            dynamic_prompt = "".join(prompt_parts)
             
             # Build multimodal content
             content_parts = []
             
             # Add screenshot if available
             if screenshot_path and os.path.exists(screenshot_path):
-                print(f"DEBUG LLM: Loading screenshot from {screenshot_path}")
-                img = PILImage.open(screenshot_path)
-                content_parts.append(img)
+                content_parts.append(_prepare_image(screenshot_path))
                 content_parts.append("\n## Screenshot Analysis\nAbove is the screenshot of the webpage.\n")
-                print(f"DEBUG LLM: Screenshot loaded successfully")
             else:
-                print(f"DEBUG LLM: Screenshot not found or path invalid: {screenshot_path}")
-            
-            # Add text prompt
-            content_parts.append(full_prompt)
-            print(f"DEBUG LLM: Content parts count: {len(content_parts)}")
+                logger.debug("Screenshot not found or path invalid: %s", screenshot_path)
             
             # Query LLM with multimodal content
-            print(f"DEBUG LLM: Calling multimodal query...")
-            response = self._query_llm_multimodal(content_parts)
-            print(f"DEBUG LLM: Response received, length: {len(response) if response else 0}")
-            return response
+            yield from self._stream_llm([_STATIC_RUBRIC] + content_parts + [dynamic_prompt])
             
         except Exception as e:
-            import traceback
             error_msg = f"Comprehensive LLM Analysis Error: {str(e)}\n{traceback.format_exc()}"
-            print(f"DEBUG LLM: {error_msg}")
-            return error_msg
+            logger.warning("Comprehensive LLM analysis failed: %s", e)
+            yield error_msg
     
     def analyze_accessibility(
         self,
-        violations: list,
+        violations: Sequence[dict],
         score: float,
-        custom_prompt: Optional[str] = None
+        custom_prompt: Optional[str] = None,
+        total_count: Optional[int] = None,
     ) -> str:
         """Get LLM analysis of accessibility violations.
         
         Args:
-            violations: List of accessibility violations
+            violations: Accessibility violations, most important first
             score: Accessibility score
             custom_prompt: Optional custom prompt to override default
+            total_count: Number of violations found, when ``violations``
+                holds only the leading ones (defaults to ``len(violations)``)
             
         Returns:
             LLM-generated analysis text
@@ -288,22 +1287,24 @@ class LLMAnalyzer:
         if custom_prompt:
             prompt = custom_prompt
         else:
-            prompt = self._build_accessibility_prompt(violations, score)
+            prompt = self._build_accessibility_prompt(violations, score, total_count)
         
-        return self._query_llm(prompt)
+        return self._query_llm(prompt, self._section_gen_cfg["accessibility"])
     
     def analyze_contrast(
         self,
-        violations: list,
+        violations: Sequence[dict],
         avg_contrast: float,
-        custom_prompt: Optional[str] = None
+        custom_prompt: Optional[str] = None,
+        total_count: Optional[int] = None,
     ) -> str:
         """Get LLM analysis of contrast issues.
         
         Args:
-            violations: List of contrast violations
+            violations: Contrast violations, most important first
             avg_contrast: Average contrast ratio
             custom_prompt: Optional custom prompt
+            total_count: Number of violations found (defaults to ``len(violations)``)
             
         Returns:
             LLM-generated analysis text
@@ -314,22 +1315,24 @@ class LLMAnalyzer:
         if custom_prompt:
             prompt = custom_prompt
         else:
-            prompt = self._build_contrast_prompt(violations, avg_contrast)
+            prompt = self._build_contrast_prompt(violations, avg_contrast, total_count)
         
-        return self._query_llm(prompt)
+        return self._query_llm(prompt, self._section_gen_cfg["contrast"])
     
     def analyze_dark_patterns(
         self,
-        flags: list,
+        flags: Sequence[dict],
         score: float,
-        custom_prompt: Optional[str] = None
+        custom_prompt: Optional[str] = None,
+        total_count: Optional[int] = None,
     ) -> str:
         """Get LLM analysis of dark patterns.
         
         Args:
-            flags: List of detected dark pattern flags
+            flags: Detected dark pattern flags, most confident first
             score: Ethical UX score
             custom_prompt: Optional custom prompt
+            total_count: Number of flags raised (defaults to ``len(flags)``)
             
         Returns:
             LLM-generated analysis text
@@ -340,9 +1343,9 @@ class LLMAnalyzer:
         if custom_prompt:
             prompt = custom_prompt
         else:
-            prompt = self._build_dark_pattern_prompt(flags, score)
+            prompt = self._build_dark_pattern_prompt(flags, score, total_count)
         
-        return self._query_llm(prompt)
+        return self._query_llm(prompt, self._section_gen_cfg["dark_patterns"])
     
     def generate_recommendations(
         self,
@@ -366,200 +1369,227 @@ class LLMAnalyzer:
         else:
             prompt = self._build_recommendations_prompt(audit_summary)
         
-        return self._query_llm(prompt)
+        return self._query_llm(prompt, self._section_gen_cfg["recommendations"])
     
-    def _build_accessibility_prompt(self, violations: list, score: float) -> str:
-        """Build prompt for accessibility analysis."""
-        template = self.config.custom_prompt_template or """
-            You are an accessibility specialist performing a WCAG 2.1 audit.
-
-            Inputs:
-            - Accessibility Score: {score:.2%}
-            - Number of Violations: {count}
-            - Detailed Violations: {violations_text}
-
-            Produce a structured audit that includes:
-
-            1. Executive Summary
-            - Short evaluation of overall accessibility health.
-            - Describe risk level and blockers that prevent task completion.
-
-            2. Top 3 Critical Issues
-            For each issue:
-            - Identify the WCAG criterion (A / AA / AAA).
-            - State the direct usability impact.
-            - Explain the functional barrier created.
-
-            3. Actionable Recommendations
-            For each issue:
-            - Exact fix (what code or design change is required).
-            - Include examples (e.g., proper ARIA, alt text, label association, color contrast values).
-            - Prioritize high-impact, low-effort changes first.
-
-            4. Users Affected
-            - Identify which user groups are impacted (screen reader users, keyboard-only users, users with low vision, cognitive load sensitivity).
-            - Explain how the barrier prevents or slows task completion.
-
-            Output requirements:
-            - Clear and concise.
-            - No generic phrasing; reference the violations explicitly.
-            - Focus on improving access without assigning blame.
+    async def aanalyze_accessibility(
+        self,
+        violations: Sequence[dict],
+        score: float,
+        custom_prompt: Optional[str] = None,
+        total_count: Optional[int] = None,
+    ) -> str:
+        """Async counterpart of :meth:`analyze_accessibility`."""
+        if not self.is_available():
+            return ""
+        
+        prompt = custom_prompt or self._build_accessibility_prompt(violations, score, total_count)
+        return await self._aquery_llm(prompt, self._section_gen_cfg["accessibility"])
+    
+    async def aanalyze_contrast(
+        self,
+        violations: Sequence[dict],
+        avg_contrast: float,
+        custom_prompt: Optional[str] = None,
+        total_count: Optional[int] = None,
+    ) -> str:
+        """Async counterpart of :meth:`analyze_contrast`."""
+        if not self.is_available():
+            return ""
+        
+        prompt = custom_prompt or self._build_contrast_prompt(violations, avg_contrast, total_count)
+        return await self._aquery_llm(prompt, self._section_gen_cfg["contrast"])
+    
+    async def aanalyze_dark_patterns(
+        self,
+        flags: Sequence[dict],
+        score: float,
+        custom_prompt: Optional[str] = None,
+        total_count: Optional[int] = None,
+    ) -> str:
+        """Async counterpart of :meth:`analyze_dark_patterns`."""
+        if not self.is_available():
+            return ""
+        
+        prompt = custom_prompt or self._build_dark_pattern_prompt(flags, score, total_count)
+        return await self._aquery_llm(prompt, self._section_gen_cfg["dark_patterns"])
+    
+    async def agenerate_recommendations(
+        self,
+        audit_summary: dict,
+        custom_prompt: Optional[str] = None
+    ) -> str:
+        """Async counterpart of :meth:`generate_recommendations`."""
+        if not self.is_available():
+            return ""
+        
+        prompt = custom_prompt or self._build_recommendations_prompt(audit_summary)
+        return await self._aquery_llm(prompt, self._section_gen_cfg["recommendations"])
+    
+    async def run_all(
+        self,
+        *,
+        accessibility: Optional[dict] = None,
+        contrast: Optional[dict] = None,
+        dark_patterns: Optional[dict] = None,
+        recommendations: Optional[dict] = None,
+    ) -> dict[str, str]:
+        """Run the per-section analyses concurrently.
+        
+        Each argument holds the keyword arguments for the matching
+        ``aanalyze_*``/``agenerate_recommendations`` call; sections passed as
+        ``None`` are skipped.
+        
+        Returns:
+            Mapping of section name to LLM response, for the requested sections
         """
+        requests = {
+            "accessibility": (self.aanalyze_accessibility, accessibility),
+            "contrast": (self.aanalyze_contrast, contrast),
+            "dark_patterns": (self.aanalyze_dark_patterns, dark_patterns),
+            "recommendations": (self.agenerate_recommendations, recommendations),
+        }
+        names = [name for name, (_, kwargs) in requests.items() if kwargs is not None]
+        responses = await asyncio.gather(
+            *(requests[name][0](**requests[name][1]) for name in names)
+        )
+        return dict(zip(names, responses))
+    
+    def analyze_all(self, **sections: Optional[dict]) -> dict[str, str]:
+        """Answer several section analyses with a single Gemini request.
+        
+        Takes the same keyword arguments as :meth:`run_all`. The section
+        prompts are sent together and the model is asked for one JSON object
+        keyed by section, so the system preamble and the round-trip are paid
+        once. This trades latency (the sections are generated one after the
+        other) for fewer requests, which matters on rate-limited keys.
         
-        violations_text = "\n".join([
-            f"- {v.get('violation_id', 'unknown')}: {v.get('description', 'No description')[:200]}"
-            for v in violations[:10]
-        ])
+        Returns:
+            Mapping of section name to response for the sections the model
+            answered; missing sections should be requested individually
+        """
+        if not self.is_available():
+            return {}
+        
+        prompts = {
+            name: self._section_prompt(name, kwargs)
+            for name, kwargs in sections.items()
+            if kwargs is not None
+        }
+        if not prompts:
+            return {}
         
-        return template.format(
+        prompt = _BATCH_INSTRUCTIONS.format(names=", ".join(prompts)) + "".join(
+            f"\n## Task: {name}\n{text}" for name, text in prompts.items()
+        )
+        # JSON mode with a schema keeps the model from wrapping or
+        # truncating the object; the instructions still describe it for
+        # SDKs that ignore the schema.
+        generation_config = {
+            **self._gen_cfg,
+            "response_mime_type": "application/json",
+            "response_schema": {
+                "type": "OBJECT",
+                "properties": {name: {"type": "STRING"} for name in prompts},
+                "required": list(prompts),
+            },
+        }
+        parsed = self._parse_json_response(self._query_llm(prompt, generation_config)) or {}
+        return {
+            name: parsed[name].strip()
+            for name in prompts
+            if isinstance(parsed.get(name), str)
+        }
+    
+    def stream_section(self, name: str, **kwargs) -> Iterator[str]:
+        """Stream one per-section analysis as it is generated.
+        
+        ``name`` is a :meth:`run_all` section (``"accessibility"``,
+        ``"contrast"``, ``"dark_patterns"`` or ``"recommendations"``) and
+        ``kwargs`` are the arguments of the matching ``analyze_*`` method.
+        
+        Yields:
+            Text chunks of the LLM response (or a single error message)
+        """
+        if not self.is_available():
+            return
+        yield from self._query_llm_stream(
+            self._section_prompt(name, kwargs), self._section_gen_cfg[name]
+        )
+    
+    def _section_prompt(self, name: str, kwargs: dict) -> str:
+        """Build the prompt for one ``run_all``/``analyze_all`` section."""
+        if kwargs.get("custom_prompt"):
+            return kwargs["custom_prompt"]
+        if name == "accessibility":
+            return self._build_accessibility_prompt(
+                kwargs["violations"], kwargs["score"], kwargs.get("total_count")
+            )
+        if name == "contrast":
+            return self._build_contrast_prompt(
+                kwargs["violations"], kwargs["avg_contrast"], kwargs.get("total_count")
+            )
+        if name == "dark_patterns":
+            return self._build_dark_pattern_prompt(
+                kwargs["flags"], kwargs["score"], kwargs.get("total_count")
+            )
+        if name == "recommendations":
+            return self._build_recommendations_prompt(kwargs["audit_summary"])
+        raise ValueError(f"Unknown analysis section: {name}")
+    
+    def run_all_blocking(self, **sections: Optional[dict]) -> dict[str, str]:
+        """Synchronous entry point for :meth:`run_all`.
+        
+        The coroutine runs on a process-wide background event loop rather
+        than a fresh ``asyncio.run`` loop, so the async gRPC channel opened
+        by the first audit is reused by later ones (a channel cannot move
+        between event loops).
+        """
+        return asyncio.run_coroutine_threadsafe(
+            self.run_all(**sections), _background_loop()
+        ).result()
+    
+    def _build_accessibility_prompt(
+        self, violations: Sequence[dict], score: float, total_count: Optional[int] = None
+    ) -> str:
+        """Build prompt for accessibility analysis."""
+        count = len(violations) if total_count is None else total_count
+        violations_text = _prompt_rows(violations, _fmt_axe_violation, 10)
+        
+        return self._accessibility_tpl.format(
             score=score,
-            count=len(violations),
+            count=count,
             violations_text=violations_text
         )
     
-    def _build_contrast_prompt(self, violations: list, avg_contrast: float) -> str:
+    def _build_contrast_prompt(
+        self, violations: Sequence[dict], avg_contrast: float, total_count: Optional[int] = None
+    ) -> str:
         """Build prompt for contrast analysis."""
-        template = self.config.custom_prompt_template or """
-            You are a visual design and accessibility specialist evaluating contrast compliance (WCAG 2.1).
-
-            Inputs:
-            - Average Contrast Ratio: {avg_contrast:.2f}:1
-            - WCAG AA requirements: 4.5:1 for normal text, 3:1 for large text
-            - Low-contrast regions detected: {count}
-            - Violations detected:
-            {violations_text}
-
-            Produce a structured assessment:
-
-            1. Readability Evaluation
-            - Assess overall visual clarity and text readability.
-            - Compare the average contrast ratio against WCAG thresholds.
-            - Identify if contrast affects primary content, navigation, or interactive elements.
-
-            2. Impact on Users
-            - Explain how low contrast affects users with low vision, color-vision deficiencies, and users in high-glare environments.
-            - State whether users may miss information or fail to identify interactive elements.
-
-            3. Practical Color Palette Recommendations
-            - Suggest specific color adjustments that meet WCAG AA contrast (e.g., increase text darkness, darken background, adjust brand palette).
-            - Provide example contrast-safe combinations with hex values when applicable.
-
-            4. Priority Fixes
-            - Rank fixes from highest to lowest impact (e.g., primary text, navigation, buttons/CTAs, secondary UI elements).
-            - Focus on high-frequency tasks and critical actions.
-
-            Output requirements:
-            - Concise, practical, design-friendly.
-            - No generic advice. Reference specific violations and contrast values.
-        """
-        
-        violations_text = "\n".join([
-            f"- Region {i+1}: Contrast {v.get('contrast_ratio', 0):.2f}:1 at position {v.get('bbox', 'unknown')}"
-            for i, v in enumerate(violations[:5])
-        ])
+        count = len(violations) if total_count is None else total_count
+        violations_text = _prompt_rows(violations, _fmt_contrast_violation, 5)
         
-        return template.format(
+        return self._contrast_tpl.format(
             avg_contrast=avg_contrast,
-            count=len(violations),
+            count=count,
             violations_text=violations_text
         )
     
-    def _build_dark_pattern_prompt(self, flags: list, score: float) -> str:
+    def _build_dark_pattern_prompt(
+        self, flags: Sequence[dict], score: float, total_count: Optional[int] = None
+    ) -> str:
         """Build prompt for dark pattern analysis."""
-        template = self.config.custom_prompt_template or """
-            You are a UX ethics specialist evaluating potentially manipulative design patterns (dark patterns).
-
-            Inputs Provided:
-            - Ethical UX Score: {score:.2%}
-            - Count of Flagged Patterns: {count}
-            - Detected Patterns:
-            {patterns_text}
-
-            Your task:
-            Produce a structured and professional audit focused on transparency, fairness, and user trust.
-
-            Required Output:
-
-            1. Ethical Risk Assessment
-            - Identify the ethical issues in the detected patterns.
-            - State whether the design restricts user autonomy, hides information, or pressures a choice.
-
-            2. How the Patterns Manipulate Users
-            - Explain the psychological or behavioral mechanism involved (e.g., confirmshaming, misdirection, forced action).
-            - Describe the user’s likely mental model and how the interface exploits it.
-
-            3. Ethical Alternatives (Actionable)
-            - Provide specific UI/UX improvements to make the design ethical and transparent.
-            - Examples:
-            - Replace manipulative microcopy with neutral wording.
-            - Make opt-out options visible and equal in visual hierarchy.
-            - Present choices without time pressure or emotional guilt.
-
-            4. Trust & Brand Reputation Impact
-            - Explain how manipulative patterns reduce long-term trust and create negative sentiment.
-            - Clarify how ethical design increases loyalty, retention, and conversion quality.
-
-            Output Style Requirements:
-            - Constructive, actionable, and user-centric.
-            - No blaming; focus on improvement and creating trust.
-        """
+        count = len(flags) if total_count is None else total_count
+        patterns_text = _prompt_rows(flags, _fmt_dark_pattern, 5)
         
-        patterns_text = "\n".join([
-            f"- {f.get('label', 'Unknown')} (confidence: {f.get('score', 0):.0%}): \"{f.get('text', '')[:150]}...\""
-            for f in flags[:5]
-        ])
-        
-        return template.format(
+        return self._dark_pattern_tpl.format(
             score=score,
-            count=len(flags),
+            count=count,
             patterns_text=patterns_text
         )
     
     def _build_recommendations_prompt(self, audit_summary: dict) -> str:
         """Build prompt for overall recommendations."""
-        template = self.config.custom_prompt_template or """
-            You are a product design consultant. Use the audit data to create a strategic improvement plan.
-
-            Inputs:
-            - Overall Design Fairness Score: {fairness_score:.2f}/1.0
-            - Accessibility Score: {accessibility_score}
-            - Average Contrast Ratio: {contrast_ratio:.2f}:1
-            - Ethical UX Score: {ethics_score:.2%}
-
-            Key Issues Identified:
-            - {accessibility_count} accessibility violations
-            - {contrast_count} contrast issues
-            - {dark_pattern_count} potential dark patterns
-
-            Output Requirements:
-
-            1. Prioritized Action Plan
-            - Quick Wins (high impact, low effort)
-            - Medium-term Improvements
-            - Long-term Enhancements
-            - Each item must include what to change and why it matters.
-
-            2. Resource Allocation
-            - Recommend how design, engineering, and accessibility resources should be distributed.
-            - Call out dependencies and sequence.
-
-            3. Implementation Timeline
-            - Provide grouped estimates (e.g., 1–2 weeks, 1 month, 1+ quarter).
-            - Prioritize accessibility blockers and ethical issues first.
-
-            4. Success Metrics
-            - Define measurable outcomes (reduction in violations, improved conversion without dark patterns, fewer support tickets).
-
-            5. Team Roles Needed
-            - Specify the roles required (designer, frontend developer, accessibility specialist, QA).
-            - Clarify what each role is responsible for.
-
-            Constraints:
-            - Advice must be practical and execution-focused.
-            - Use concise language. No filler text.
-        """
-        
-        return template.format(
+        return self._recommendations_tpl.format(
             fairness_score=audit_summary.get('fairness_score', 0),
             accessibility_score=audit_summary.get('accessibility_score', 'N/A'),
             contrast_ratio=audit_summary.get('contrast_ratio', 0),
@@ -569,88 +1599,192 @@ class LLMAnalyzer:
             dark_pattern_count=audit_summary.get('dark_pattern_count', 0)
         )
     
-    def _query_llm(self, prompt: str) -> str:
+    def _section_content(self, prompt: str) -> tuple[str, object]:
+        """Body and model for a per-section request.
+
+        The system prompt travels as the section model's system instruction,
+        so every request starts with the same prefix; SDKs without
+        ``system_instruction`` get it prepended to the prompt instead.
+        """
+        if self._section_model is not None:
+            return prompt, self._section_model
+        return _SYSTEM_INSTRUCTION + prompt, self._model
+    
+    def _query_llm(self, prompt: str, generation_config: Optional[dict] = None) -> str:
         """Send query to LLM and return response.
         
         Args:
             prompt: Prompt text to send to LLM
+            generation_config: Overrides the analyzer's generation settings
             
         Returns:
             LLM response text
         """
-        if not self._model:
+        if not self.is_available():
+            return ""
+        
+        try:
+            generation_config = generation_config or self._gen_cfg
+            
+            response_key = self._response_key(_SYSTEM_INSTRUCTION + prompt, generation_config)
+            stored = self._cached_response(response_key)
+            if stored is not None:
+                return stored
+            similar, embedding = self._semantic_lookup(prompt)
+            if similar is not None:
+                return similar
+            
+            content, model = self._section_content(prompt)
+            response = self._generate(
+                content,
+                generation_config,
+                model=model,
+            )
+            
+            text = response.text.strip()
+            self._store_response(response_key, text)
+            self._semantic_store(embedding, text)
+            return text
+            
+        except Exception as e:
+            return f"LLM Analysis Error: {str(e)}"
+    
+    async def _aquery_llm(self, prompt: str, generation_config: Optional[dict] = None) -> str:
+        """Async counterpart of :meth:`_query_llm`."""
+        if not self.is_available():
             return ""
         
         try:
-            # Add system instruction to the prompt
-            full_prompt =  """
-            You are an expert in web accessibility, inclusive design, and ethical UX.
-
-            Role:
-            - Identify barriers that prevent users from accessing or understanding content.
-            - Recommend specific, actionable improvements to meet WCAG 2.1 guidelines.
-            - Promote ethical and inclusive decision-making in product design.
-
-            Expectations:
-            - Reference WCAG criteria when applicable.
-            - Use clear and direct language.
-            - Avoid vague or generic advice.
-            - Focus on practical steps that design and engineering teams can implement.
-
-            Your output should:
-            - Diagnose the issue concisely.
-            - Explain why it matters for users.
-            - Provide a clear, actionable fix.
-
-            Goal:
-            Help teams build accessible, inclusive, and ethical digital products that work for everyone.
-        """ + prompt
-            
-            # Configure generation parameters
-            generation_config = {
-                "temperature": self.config.temperature,
-                "max_output_tokens": self.config.max_tokens,
-            }
-            
-            response = self._model.generate_content(
-                full_prompt,
-                generation_config=generation_config
+            generation_config = generation_config or self._gen_cfg
+            
+            response_key = self._response_key(_SYSTEM_INSTRUCTION + prompt, generation_config)
+            stored = self._cached_response(response_key)
+            if stored is not None:
+                return stored
+            similar, embedding = await asyncio.to_thread(self._semantic_lookup, prompt)
+            if similar is not None:
+                return similar
+            
+            content, model = self._section_content(prompt)
+            response = await self._agenerate(
+                content,
+                generation_config,
+                model=model,
             )
             
-            return response.text.strip()
+            text = response.text.strip()
+            self._store_response(response_key, text)
+            self._semantic_store(embedding, text)
+            return text
             
         except Exception as e:
             return f"LLM Analysis Error: {str(e)}"
     
-    def _query_llm_multimodal(self, content_parts: list) -> str:
+    def _query_llm_stream(self, prompt: str, generation_config: Optional[dict] = None) -> Iterator[str]:
+        """Streaming variant of :meth:`_query_llm`; shares its response caches."""
+        if not self.is_available():
+            return
+        
+        try:
+            generation_config = generation_config or self._gen_cfg
+            
+            response_key = self._response_key(_SYSTEM_INSTRUCTION + prompt, generation_config)
+            stored = self._cached_response(response_key)
+            if stored is not None:
+                yield stored
+                return
+            similar, embedding = self._semantic_lookup(prompt)
+            if similar is not None:
+                yield similar
+                return
+            
+            content, model = self._section_content(prompt)
+            response = self._generate(
+                content,
+                generation_config,
+                stream=True,
+                model=model,
+            )
+            
+            chunks = []
+            for chunk in response:
+                if chunk.text:
+                    chunks.append(chunk.text)
+                    yield chunk.text
+            text = "".join(chunks).strip()
+            self._store_response(response_key, text)
+            self._semantic_store(embedding, text)
+            
+        except Exception as e:
+            yield f"LLM Analysis Error: {str(e)}"
+    
+    def _query_llm_multimodal(
+        self,
+        content_parts: list,
+    ) -> str:
         """Send multimodal query (text + images) to LLM.
         
         Args:
-            content_parts: List of content parts (strings and PIL Images)
+            content_parts: List of content parts (strings, image blobs or PIL Images)
             
         Returns:
             LLM response text
         """
-        if not self._model:
+        if not self.is_available():
             return ""
         
         try:
-            # Configure generation parameters
-            generation_config = {
-                "temperature": self.config.temperature,
-                "max_output_tokens": self.config.max_tokens,
-            }
-            
-            response = self._model.generate_content(
-                content_parts,
-                generation_config=generation_config
-            )
+            generation_config = self._gen_cfg
+            
+            response_key = self._response_key(content_parts, generation_config)
+            stored = self._cached_response(response_key)
+            if stored is not None:
+                return stored
+            
+            response = self._generate(content_parts, generation_config)
             
-            return response.text.strip()
+            text = response.text.strip()
+            self._store_response(response_key, text)
+            return text
             
         except Exception as e:
             return f"Multimodal LLM Analysis Error: {str(e)}"
 
+    def _stream_llm(
+        self,
+        content_parts: list,
+    ) -> Iterator[str]:
+        """Streaming variant of :meth:`_query_llm_multimodal`.
+        
+        Yields:
+            Response text chunks as the model produces them
+        """
+        if not self.is_available():
+            return
+        
+        try:
+            generation_config = self._gen_cfg
+            
+            response_key = self._response_key(content_parts, generation_config)
+            stored = self._cached_response(response_key)
+            if stored is not None:
+                yield stored
+                return
+            
+            # Only opening the stream is retried; a failure mid-stream
+            # surfaces as an error chunk.
+            response = self._generate(content_parts, generation_config, stream=True)
+            
+            chunks = []
+            for chunk in response:
+                if chunk.text:
+                    chunks.append(chunk.text)
+                    yield chunk.text
+            self._store_response(response_key, "".join(chunks))
+            
+        except Exception as e:
+            yield f"Multimodal LLM Analysis Error: {str(e)}"
+
     def assess_design_multimodal(
         self,
         *,
@@ -673,95 +1807,40 @@ class LLMAnalyzer:
             "url": url,
         }
 
-        prompt = textwrap.dedent(
-            """
-            You are an independent UX fairness auditor. Review the provided website evidence
-            (screenshot plus heuristics) and validate two things:
-
-            1. Ethical UX / Potential Dark Patterns
-               - Identify only genuine manipulative patterns.
-               - Prefer precision over recall; ignore benign persuasive design.
-               - For each confirmed pattern, provide label, severity (none/low/medium/high),
-                 confidence (0.0-1.0) and an explanation users understand.
-               - Suggest a clear recommendation to fix the pattern.
-               - Compute an overall score in [0, 1] where 1.0 means no concerning patterns.
-
-            2. Visual Contrast & Legibility
-               - Focus on real text contrast or readability issues.
-               - Ignore decorative elements or acceptable gradients.
-               - For confirmed contrast issues, state area, severity (low/medium/high),
-                 estimated contrast ratio if visible, and actionable recommendation.
-               - Provide an overall score in [0, 1] where 1.0 means excellent contrast.
-
-            Respond with strict JSON matching:
-
-            {
-              "dark_patterns": {
-                "overall_score": float,
-                "patterns": [
-                  {
-                    "label": string,
-                    "severity": "none" | "low" | "medium" | "high",
-                    "confidence": float,
-                    "explanation": string,
-                    "recommendation": string
-                  }
-                ]
-              },
-              "contrast": {
-                "overall_score": float,
-                "issues": [
-                  {
-                    "area": string,
-                    "severity": "low" | "medium" | "high",
-                    "contrast_ratio_estimate": float | null,
-                    "explanation": string,
-                    "recommendation": string
-                  }
-                ]
-              }
-            }
-
-            Do not emit any text outside the JSON object.
-            """
-        )
-
+        prompt = "\nHeuristic signals (JSON):\n" + _json_dumps(heuristics_payload) + "\n"
         if dom_excerpt:
-            truncated = dom_excerpt[:4000]
-        else:
-            truncated = ""
+            # Same outline and token budget as the comprehensive analysis;
+            # plain visible text falls back to its leading tokens.
+            dom_outline, truncated = _summarize_html(dom_excerpt)
+            label = "DOM excerpt (truncated)" if truncated else "DOM excerpt"
+            prompt += f"\n{label}:\n{dom_outline}\n"
 
-        prompt += "\nHeuristic signals (JSON):\n" + json.dumps(heuristics_payload, ensure_ascii=False) + "\n"
-        if truncated:
-            prompt += "\nDOM excerpt (truncated):\n" + truncated + "\n"
-
-        content_parts = []
+        # The instructions stay first so every request shares the same
+        # prefix; the screenshot and heuristics follow.
+        content_parts = [_VALIDATION_PROMPT]
 
         if screenshot_path and os.path.exists(screenshot_path):
             try:
-                from PIL import Image as PILImage
-
-                image = PILImage.open(screenshot_path)
-                content_parts.append(image)
+                content_parts.append(_prepare_image(screenshot_path))
             except Exception as exc:  # pragma: no cover - best effort context
-                print(f"DEBUG LLM: Failed to load screenshot for multimodal check: {exc}")
+                logger.debug("Failed to load screenshot for multimodal check: %s", exc)
 
         content_parts.append(prompt)
 
-        generation_config = {
-            "temperature": min(self.config.temperature, 0.3),
-            "max_output_tokens": min(self.config.max_tokens, 4000),
-        }
+        generation_config = self._gen_cfg_strict
 
         try:
-            response = self._model.generate_content(
-                content_parts,
-                generation_config=generation_config,
-            )
-            raw_text = (response.text or "").strip()
-            return self._parse_json_response(raw_text)
+            response_key = self._response_key(content_parts, generation_config)
+            raw_text = self._cached_response(response_key)
+            if raw_text is None:
+                response = self._generate(content_parts, generation_config)
+                raw_text = (response.text or "").strip()
+            parsed = self._parse_json_response(raw_text)
+            if parsed is not None:
+                self._store_response(response_key, raw_text)
+            return parsed
         except Exception as exc:
-            print(f"DEBUG LLM: Multimodal validation failed: {exc}")
+            logger.warning("Multimodal validation failed: %s", exc)
             return None
 
     def _parse_json_response(self, raw_text: str) -> Optional[dict]:
@@ -771,17 +1850,13 @@ class LLMAnalyzer:
         cleaned = raw_text.strip()
 
         if cleaned.startswith("```"):
-            cleaned = re.sub(r"^```(?:json)?", "", cleaned).strip()
-            cleaned = re.sub(r"```$", "", cleaned).strip()
+            cleaned = cleaned[3:].removeprefix("json").strip()
+            cleaned = cleaned.removesuffix("```").strip()
 
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError.
         try:
-            return json.loads(cleaned)
+            parsed = _json_loads(cleaned)
         except json.JSONDecodeError:
-            # Attempt to locate the first JSON object in the string
-            match = re.search(r"\{.*\}", cleaned, re.DOTALL)
-            if match:
-                try:
-                    return json.loads(match.group(0))
-                except json.JSONDecodeError:
-                    return None
-            return None
+            # Locate the first JSON object embedded in surrounding prose
+            return _find_json_object(cleaned)
+        return parsed if isinstance(parsed, dict) else None
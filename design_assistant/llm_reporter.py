@@ -1,19 +1,151 @@
 """Report generation with rule-based templates and optional LLM integration."""
 from __future__ import annotations
 
+import heapq
+import logging
+from bisect import bisect_right
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Optional
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, TextIO
+
+logger = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
     from .pipeline import PipelineResult
 
 try:
-    from .llm_integration import LLMAnalyzer, LLMConfig
+    from .llm_integration import LLMConfig, get_llm_analyzer
     HAS_LLM = True
 except ImportError:
     HAS_LLM = False
 
 
+# Score bands: bisect_right(thresholds, score) indexes the matching
+# severity/message tuple, lowest band first.
+
+_SEVERITY_LEVELS = ("critical", "warning", "info")
+_SCORE_THRESHOLDS = (0.5, 0.8)  # accessibility and ethical UX scores
+_CONTRAST_THRESHOLDS = (3.0, 4.5)  # average contrast ratio
+
+_FAIRNESS_THRESHOLDS = (0.4, 0.6, 0.8)
+_FAIRNESS_MESSAGES = (
+    ("critical issues detected",
+     "The interface has significant accessibility barriers and ethical design issues requiring immediate attention."),
+    ("needs improvement",
+     "The interface has several accessibility and ethical concerns that should be addressed."),
+    ("good with room for improvement",
+     "The interface shows good baseline compliance but has opportunities for enhancement."),
+    ("excellent",
+     "The interface demonstrates strong adherence to accessibility standards and ethical design principles."),
+)
+
+_ACCESSIBILITY_OVERVIEW = (
+    "This interface has critical accessibility barriers that prevent users with disabilities from accessing content.",
+    "This interface has moderate accessibility issues that should be addressed to ensure inclusive design.",
+    "This interface demonstrates good accessibility practices with minor issues to resolve.",
+)
+_CONTRAST_ASSESSMENT = (
+    "🔴 CRITICAL: The interface has significant contrast issues that make text illegible for users with low vision or color blindness.",
+    "⚠️ WARNING: Multiple regions fall below WCAG AA standards. Users with visual impairments may struggle to read content.",
+    "✅ GOOD: Most text meets minimum contrast requirements, though some areas could be improved for AAA compliance.",
+)
+_DARK_PATTERN_ASSESSMENT = (
+    "🔴 CRITICAL: Multiple manipulative design patterns detected. The interface may violate user trust and consent principles.",
+    "⚠️ WARNING: Some potentially manipulative design elements identified. Review for ethical compliance.",
+    "✅ GOOD: The interface demonstrates ethical design practices with minimal concerning patterns.",
+)
+
+# Static Markdown appended to the rule-based sections
+
+_PATTERN_EXPLANATIONS = {
+    "Urgency": "Creates artificial time pressure to rush user decisions",
+    "Confirm-shaming": "Uses guilt or shame to manipulate user choices",
+    "Misdirection": "Directs attention away from important information or choices",
+}
+
+_ACCESSIBILITY_IMPACT = """
+
+### Impact on Users
+These accessibility violations may prevent or hinder users with:
+- Visual impairments (screen reader users, low vision)
+- Motor disabilities (keyboard-only navigation)
+- Cognitive disabilities (complex navigation, unclear labels)
+- Temporary disabilities (broken mouse, bright sunlight)
+"""
+
+_CONTRAST_FOOTER = """
+
+### User Impact
+Low contrast affects:
+- Users with low vision or color blindness
+- Users in bright sunlight or poor lighting
+- Older users with age-related vision changes
+- All users experiencing screen glare
+
+### Recommendations
+- Increase foreground/background color difference
+- Use darker text on light backgrounds (or vice versa)
+- Test with color blindness simulators
+- Avoid relying solely on color to convey information
+"""
+
+_ETHICS_FOOTER = """
+
+### Ethical Design Principles
+A trustworthy interface should:
+- Respect user autonomy and informed consent
+- Be transparent about costs, commitments, and data usage
+- Make it easy to cancel, unsubscribe, or delete accounts
+- Avoid pressuring users with artificial urgency
+- Present choices clearly without guilt or shame
+"""
+
+_STRATEGY_FOOTER = """
+### Implementation Strategy
+
+1. **Quick Wins (1-2 weeks)**
+   - Fix critical accessibility violations
+   - Adjust color contrast for key text elements
+   - Remove obvious dark pattern language
+
+2. **Medium Term (1-2 months)**
+   - Full WCAG audit and remediation
+   - Redesign low-contrast UI components
+   - Establish ethical design guidelines
+
+3. **Long Term (Ongoing)**
+   - Regular accessibility audits
+   - User testing with diverse populations
+   - Continuous monitoring of design patterns
+"""
+
+_LIMITATIONS = """
+### Limitations
+
+- Automated tools catch ~30-40% of accessibility issues; manual testing required
+- Contrast detection uses heuristics; manual review of flagged regions recommended
+- Dark pattern detection based on text analysis; visual deception not captured
+- Screenshot-only mode cannot perform full accessibility audits
+"""
+
+_ABOUT_FOOTER = """
+## About This Report
+
+This audit was generated using:
+- Automated accessibility testing (axe-core)
+- Computer vision for contrast analysis (OpenCV)
+- Keyword-based dark pattern detection
+- Rule-based report templates with optional Gemini LLM integration
+
+**Note**: Narrative explanations use rule-based templates derived from audit results.
+When a Gemini API key is configured, additional LLM-generated insights are included.
+
+For questions or to request a manual accessibility audit, please consult with accessibility experts.
+"""
+
+
 @dataclass
 class LLMReportSection:
     """Individual section of a generated report."""
@@ -39,15 +171,22 @@ class LLMReportGenerator:
         """
         self.llm_config = llm_config
         self.llm_analyzer = None
+        # Set by each build: True when an available LLM's comprehensive
+        # analysis failed and the report fell back to rule-based sections
+        self.llm_fallback = False
         
         if llm_config and HAS_LLM:
             try:
-                self.llm_analyzer = LLMAnalyzer(llm_config)
+                self.llm_analyzer = get_llm_analyzer(llm_config)
             except Exception as e:
                 print(f"Warning: Could not initialize LLM analyzer: {e}")
                 print("Falling back to rule-based reporting only.")
         
-    def generate_comprehensive_report(self, result: "PipelineResult") -> str:  # noqa: C901
+    def llm_available(self) -> bool:
+        """Whether reports from this generator include LLM analysis."""
+        return bool(self.llm_analyzer and self.llm_analyzer.is_available())
+    
+    def generate_comprehensive_report(self, result: "PipelineResult") -> str:
         """Generate a detailed narrative report from audit results.
         
         Args:
@@ -56,47 +195,155 @@ class LLMReportGenerator:
         Returns:
             Markdown-formatted report string
         """
+        return self._format_report(self._build_sections(result))
+    
+    def write_comprehensive_report(self, result: "PipelineResult", path: Path) -> Path:
+        """Write the report for ``result`` straight to ``path``.
+        
+        Sections are streamed to the file instead of being joined into one
+        report string first.
+        """
+        sections = self._build_sections(result)
+        with open(path, "w", encoding="utf-8") as out:
+            self._format_report(sections, out)
+        return path
+    
+    def _build_sections(self, result: "PipelineResult") -> list[LLMReportSection]:  # noqa: C901
+        """Generate the report sections, LLM-backed where available."""
         sections = []
+        self.llm_fallback = False
         
         # Try comprehensive LLM analysis first if available
-        print(f"DEBUG: LLM analyzer available: {self.llm_analyzer is not None}")
-        if self.llm_analyzer:
-            print(f"DEBUG: LLM is_available: {self.llm_analyzer.is_available()}")
-        
-        if self.llm_analyzer and self.llm_analyzer.is_available():
-            print(f"DEBUG: Attempting comprehensive LLM analysis...")
+        if self.llm_available():
+            logger.debug("Attempting comprehensive LLM analysis")
             llm_comprehensive = self._generate_llm_comprehensive_analysis(result)
-            print(f"DEBUG: Comprehensive analysis result: {llm_comprehensive is not None}")
             if llm_comprehensive:
-                print(f"DEBUG: Using comprehensive LLM analysis for report")
+                logger.debug("Using comprehensive LLM analysis for report")
                 sections.append(llm_comprehensive)
                 # Still add technical details at the end
                 sections.append(self._generate_technical_details(result))
-                return self._format_report(sections)
+                return sections
             else:
-                print(f"DEBUG: Comprehensive analysis returned None, falling back to rule-based")
+                logger.debug("Comprehensive analysis returned None, falling back to rule-based")
+                self.llm_fallback = True
+        else:
+            logger.debug("LLM analyzer unavailable, using rule-based report")
+        
+        # Fall back to rule-based generation with individual LLM enhancements,
+        # fetched concurrently up front; the sections that do not need them
+        # are built while the requests are in flight.
+        if self.llm_analyzer and self.llm_analyzer.is_available():
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                pending = pool.submit(self._prefetch_llm_sections, result)
+                executive_summary = self._generate_executive_summary(result)
+                technical_details = self._generate_technical_details(result)
+                llm_responses = pending.result()
+        else:
+            executive_summary = self._generate_executive_summary(result)
+            technical_details = self._generate_technical_details(result)
+            llm_responses = {}
         
-        # Fall back to rule-based generation with individual LLM enhancements
         # Executive Summary
-        sections.append(self._generate_executive_summary(result))
+        sections.append(executive_summary)
         
         # Accessibility Analysis
         if result.accessibility:
-            sections.append(self._generate_accessibility_analysis(result))
+            sections.append(self._generate_accessibility_analysis(
+                result, llm_responses.get("accessibility")
+            ))
         
         # Contrast & Visual Design
-        sections.append(self._generate_contrast_analysis(result))
+        sections.append(self._generate_contrast_analysis(result, llm_responses.get("contrast")))
         
         # Dark Pattern & Ethics Analysis
-        sections.append(self._generate_dark_pattern_analysis(result))
+        sections.append(self._generate_dark_pattern_analysis(
+            result, llm_responses.get("dark_patterns")
+        ))
         
         # Recommendations
-        sections.append(self._generate_recommendations(result))
+        sections.append(self._generate_recommendations(result, llm_responses.get("recommendations")))
         
         # Technical Details
-        sections.append(self._generate_technical_details(result))
+        sections.append(technical_details)
         
-        return self._format_report(sections)
+        return sections
+    
+    def _llm_section_requests(self, result: "PipelineResult") -> dict:
+        """Keyword arguments for each per-section LLM call."""
+        acc = result.accessibility
+        contrast = result.contrast
+        dp = result.dark_patterns
+        requests = {
+            "contrast": {
+                "violations": [
+                    {
+                        "bbox": v.bbox,
+                        "ratio": v.contrast_ratio
+                    }
+                    # Rows the prompt lists: the lowest ratios
+                    for v in heapq.nsmallest(5, contrast.violations, key=lambda v: v.contrast_ratio)
+                ],
+                "avg_contrast": contrast.average_contrast,
+                "total_count": len(contrast.violations),
+            },
+            "dark_patterns": {
+                "flags": [
+                    {
+                        "label": f.label,
+                        "text": f.text[:200],  # Truncate long text
+                        "score": f.score
+                    }
+                    for f in dp.flags[:15]  # Spare rows stand in for repeats
+                ],
+                "score": dp.score,
+                "total_count": len(dp.flags),
+            },
+            "recommendations": {
+                "audit_summary": {
+                    "accessibility_score": acc.score if acc else None,
+                    "accessibility_violations": len(acc.violations) if acc else 0,
+                    "contrast_avg": contrast.average_contrast,
+                    "contrast_violations": len(contrast.violations),
+                    "dark_patterns_score": dp.score,
+                    "dark_patterns_count": len(dp.flags),
+                    "fairness_score": result.fairness.value
+                },
+            },
+        }
+        if acc:
+            requests["accessibility"] = {
+                "violations": [
+                    {
+                        "id": v.violation_id,
+                        "impact": v.impact,
+                        "description": v.description,
+                        "node_count": len(v.nodes)
+                    }
+                    for v in acc.violations[:10]  # Rows the prompt lists
+                ],
+                "score": acc.score,
+                "total_count": len(acc.violations),
+            }
+        return requests
+    
+    def _prefetch_llm_sections(self, result: "PipelineResult") -> dict:
+        """Issue the per-section LLM calls concurrently, or as one batched
+        request when ``LLMConfig.batch_sections`` is set.
+        
+        Sections missing from the result (no LLM, or a failed batch) are
+        queried one at a time by the section generators as before.
+        """
+        if not (self.llm_analyzer and self.llm_analyzer.is_available()):
+            return {}
+        
+        requests = self._llm_section_requests(result)
+        try:
+            if getattr(self.llm_config, "batch_sections", False):
+                return self.llm_analyzer.analyze_all(**requests)
+            return self.llm_analyzer.run_all_blocking(**requests)
+        except Exception as e:
+            print(f"Warning: Concurrent LLM analysis failed: {e}")
+            return {}
     
     def _generate_llm_comprehensive_analysis(self, result: "PipelineResult") -> Optional[LLMReportSection]:
         """Generate analysis using LLM with screenshot and HTML."""
@@ -106,9 +353,7 @@ class LLMReportGenerator:
             html_path = result.artifacts.get('dom_path')
             url = result.artifacts.get('url')
             
-            print(f"DEBUG: Screenshot path: {screenshot_path}")
-            print(f"DEBUG: HTML path: {html_path}")
-            print(f"DEBUG: URL: {url}")
+            logger.debug("Screenshot path: %s, HTML path: %s, URL: %s", screenshot_path, html_path, url)
             
             # Read HTML content if available
             html_content = None
@@ -117,9 +362,9 @@ class LLMReportGenerator:
                 html_file = Path(html_path)
                 if html_file.exists():
                     html_content = html_file.read_text(encoding='utf-8')
-                    print(f"DEBUG: HTML content loaded, length: {len(html_content)}")
+                    logger.debug("HTML content loaded, length: %d", len(html_content))
                 else:
-                    print(f"DEBUG: HTML file does not exist: {html_path}")
+                    logger.debug("HTML file does not exist: %s", html_path)
             
             # Prepare metrics data
             accessibility_data = None
@@ -141,7 +386,7 @@ class LLMReportGenerator:
             }
             
             # Get comprehensive LLM analysis
-            print(f"DEBUG: Calling LLM comprehensive analysis...")
+            logger.debug("Calling LLM comprehensive analysis")
             llm_response = self.llm_analyzer.analyze_comprehensive(
                 screenshot_path=str(screenshot_path) if screenshot_path else None,
                 html_content=html_content,
@@ -151,8 +396,12 @@ class LLMReportGenerator:
                 dark_pattern_data=dark_pattern_data
             )
             
-            print(f"DEBUG: LLM response received, length: {len(llm_response) if llm_response else 0}")
-            print(f"DEBUG: LLM response preview: {llm_response[:200] if llm_response else 'None'}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "LLM response received, length: %d, preview: %s",
+                    len(llm_response) if llm_response else 0,
+                    llm_response[:200] if llm_response else None,
+                )
             
             if llm_response and not llm_response.startswith("Error"):
                 # Add computed metrics summary at the top
@@ -175,18 +424,15 @@ class LLMReportGenerator:
 {llm_response}
 
 """
-                print(f"DEBUG: Returning comprehensive analysis section")
                 return LLMReportSection(
                     title="Full Analysis",
                     content=metrics_summary,
                     severity="info"
                 )
-            else:
-                print(f"DEBUG: LLM response empty or error: {llm_response}")
-        except Exception as e:
-            import traceback
-            print(f"Warning: LLM analysis failed: {e}")
-            print(f"Traceback: {traceback.format_exc()}")
+            elif logger.isEnabledFor(logging.DEBUG):
+                logger.debug("LLM response empty or error: %s", (llm_response or "")[:200])
+        except Exception:
+            logger.exception("Comprehensive LLM analysis failed")
         
         return None
     
@@ -194,18 +440,7 @@ class LLMReportGenerator:
         """Generate high-level executive summary."""
         fairness_score = result.fairness.value
         
-        if fairness_score >= 0.8:
-            assessment = "excellent"
-            tone = "The interface demonstrates strong adherence to accessibility standards and ethical design principles."
-        elif fairness_score >= 0.6:
-            assessment = "good with room for improvement"
-            tone = "The interface shows good baseline compliance but has opportunities for enhancement."
-        elif fairness_score >= 0.4:
-            assessment = "needs improvement"
-            tone = "The interface has several accessibility and ethical concerns that should be addressed."
-        else:
-            assessment = "critical issues detected"
-            tone = "The interface has significant accessibility barriers and ethical design issues requiring immediate attention."
+        assessment, tone = _FAIRNESS_MESSAGES[bisect_right(_FAIRNESS_THRESHOLDS, fairness_score)]
         
         acc_score = f"{result.accessibility.score:.2%}" if result.accessibility else "N/A (screenshot-only mode)"
         acc_violations = len(result.accessibility.violations) if result.accessibility else 0
@@ -235,7 +470,9 @@ This report covers WCAG compliance, visual contrast quality, and ethical UX patt
             severity="info"
         )
     
-    def _generate_accessibility_analysis(self, result: "PipelineResult") -> LLMReportSection:
+    def _generate_accessibility_analysis(
+        self, result: "PipelineResult", llm_response: Optional[str] = None
+    ) -> LLMReportSection:
         """Generate detailed accessibility findings."""
         acc = result.accessibility
         if not acc:
@@ -245,112 +482,91 @@ This report covers WCAG compliance, visual contrast quality, and ethical UX patt
                 severity="info"
             )
         
-        severity = "critical" if acc.score < 0.5 else "warning" if acc.score < 0.8 else "info"
+        level = bisect_right(_SCORE_THRESHOLDS, acc.score)
+        severity = _SEVERITY_LEVELS[level]
         
-        violations_by_impact = {}
+        # One pass: totals per impact, and the first 5 rule IDs per impact
+        # (first violation plus instance count) for display
+        impact_counts = Counter()
+        shown_by_impact: dict[str, dict[str, list]] = {}
         for v in acc.violations:
             impact = v.impact or "unknown"
-            violations_by_impact.setdefault(impact, []).append(v)
+            impact_counts[impact] += 1
+            shown = shown_by_impact.setdefault(impact, {})
+            entry = shown.get(v.violation_id)
+            if entry is not None:
+                entry[1] += 1
+            elif len(shown) < 5:
+                shown[v.violation_id] = [v, 1]
         
         # Get LLM analysis if available
         llm_insights = ""
         if self.llm_analyzer:
             try:
-                # Prepare violation summary for LLM
-                violations_data = [
-                    {
-                        "id": v.violation_id,
-                        "impact": v.impact,
-                        "description": v.description,
-                        "node_count": len(v.nodes)
-                    }
-                    for v in acc.violations[:20]  # Top 20 violations
-                ]
-                llm_response = self.llm_analyzer.analyze_accessibility(
-                    violations=violations_data,
-                    score=acc.score
-                )
+                if llm_response is None:
+                    llm_response = self.llm_analyzer.analyze_accessibility(
+                        **self._llm_section_requests(result)["accessibility"]
+                    )
                 llm_insights = f"\n\n### LLM Analysis\n\n{llm_response}\n"
             except Exception as e:
                 print(f"Warning: LLM analysis failed: {e}")
         
-        content = f"""
+        parts = [f"""
 ## Accessibility Analysis (WCAG Compliance)
 
 **Score**: {acc.score:.2%} | **Total Violations**: {len(acc.violations)}
 
 ### Overview
-{"This interface has critical accessibility barriers that prevent users with disabilities from accessing content." if acc.score < 0.5 else 
- "This interface has moderate accessibility issues that should be addressed to ensure inclusive design." if acc.score < 0.8 else
- "This interface demonstrates good accessibility practices with minor issues to resolve."}
+{_ACCESSIBILITY_OVERVIEW[level]}
 {llm_insights}
 ### Violations Breakdown by Impact:
-"""
+"""]
         
         for impact in ["critical", "serious", "moderate", "minor"]:
-            if impact in violations_by_impact:
-                viols = violations_by_impact[impact]
-                content += f"\n#### {impact.title()} Impact ({len(viols)} issues)\n"
-                
-                # Group by violation ID
-                by_id = {}
-                for v in viols:
-                    by_id.setdefault(v.violation_id, []).append(v)
+            if impact in impact_counts:
+                parts.append(f"\n#### {impact.title()} Impact ({impact_counts[impact]} issues)\n")
                 
-                for vid, instances in list(by_id.items())[:5]:  # Top 5
-                    v = instances[0]
-                    content += f"\n**{vid}** ({len(instances)} instance{'s' if len(instances) > 1 else ''})\n"
-                    content += f"- Description: {v.description}\n"
+                for vid, (v, instances) in shown_by_impact[impact].items():
+                    parts.append(f"\n**{vid}** ({instances} instance{'s' if instances > 1 else ''})\n")
+                    parts.append(f"- Description: {v.description}\n")
                     if v.help_url:
-                        content += f"- Learn more: {v.help_url}\n"
-                    content += f"- Affected elements: {min(len(instances), 3)} shown\n"
+                        parts.append(f"- Learn more: {v.help_url}\n")
+                    parts.append(f"- Affected elements: {min(instances, 3)} shown\n")
                     for node in v.nodes[:3]:
-                        content += f"  - `{node[:100]}...`\n" if len(node) > 100 else f"  - `{node}`\n"
+                        parts.append(f"  - `{node[:100]}...`\n" if len(node) > 100 else f"  - `{node}`\n")
         
-        content += """
-
-### Impact on Users
-These accessibility violations may prevent or hinder users with:
-- Visual impairments (screen reader users, low vision)
-- Motor disabilities (keyboard-only navigation)
-- Cognitive disabilities (complex navigation, unclear labels)
-- Temporary disabilities (broken mouse, bright sunlight)
-"""
+        parts.append(_ACCESSIBILITY_IMPACT)
         
         return LLMReportSection(
             title="Accessibility Analysis",
-            content=content,
+            content="".join(parts),
             severity=severity
         )
     
-    def _generate_contrast_analysis(self, result: "PipelineResult") -> LLMReportSection:
+    def _generate_contrast_analysis(
+        self, result: "PipelineResult", llm_response: Optional[str] = None
+    ) -> LLMReportSection:
         """Generate contrast and visual design analysis."""
         contrast = result.contrast
         avg_contrast = contrast.average_contrast
         violations = len(contrast.violations)
         
-        severity = "critical" if avg_contrast < 3.0 else "warning" if avg_contrast < 4.5 else "info"
+        level = bisect_right(_CONTRAST_THRESHOLDS, avg_contrast)
+        severity = _SEVERITY_LEVELS[level]
         
         # Get LLM analysis if available
         llm_insights = ""
         if self.llm_analyzer:
             try:
-                violations_data = [
-                    {
-                        "bbox": v.bbox,
-                        "ratio": v.contrast_ratio
-                    }
-                    for v in contrast.violations[:15]  # Top 15 violations
-                ]
-                llm_response = self.llm_analyzer.analyze_contrast(
-                    violations=violations_data,
-                    avg_contrast=avg_contrast
-                )
+                if llm_response is None:
+                    llm_response = self.llm_analyzer.analyze_contrast(
+                        **self._llm_section_requests(result)["contrast"]
+                    )
                 llm_insights = f"\n\n### LLM Analysis\n\n{llm_response}\n"
             except Exception as e:
                 print(f"Warning: LLM analysis failed: {e}")
         
-        content = f"""
+        parts = [f"""
 ## Visual Contrast Analysis
 
 **Average Contrast Ratio**: {avg_contrast:.2f}:1 | **Low-Contrast Regions**: {violations}
@@ -361,74 +577,54 @@ These accessibility violations may prevent or hinder users with:
 - **AAA Standard (Normal Text)**: 7:1 minimum
 
 ### Assessment
-{"🔴 CRITICAL: The interface has significant contrast issues that make text illegible for users with low vision or color blindness." if avg_contrast < 3.0 else
- "⚠️ WARNING: Multiple regions fall below WCAG AA standards. Users with visual impairments may struggle to read content." if avg_contrast < 4.5 else
- "✅ GOOD: Most text meets minimum contrast requirements, though some areas could be improved for AAA compliance."}
+{_CONTRAST_ASSESSMENT[level]}
 {llm_insights}
 ### Detected Issues
-"""
+"""]
         
         if violations > 0:
-            content += f"\nFound {violations} regions with insufficient contrast:\n\n"
-            for i, v in enumerate(contrast.violations[:10], 1):
+            parts.append(f"\nFound {violations} regions with insufficient contrast (lowest ratios first):\n\n")
+            worst = heapq.nsmallest(10, contrast.violations, key=lambda v: v.contrast_ratio)
+            for i, v in enumerate(worst, 1):
                 x, y, w, h = v.bbox
-                content += f"{i}. **Region at ({x}, {y})** - Size: {w}×{h}px - Ratio: {v.contrast_ratio:.2f}:1\n"
+                parts.append(f"{i}. **Region at ({x}, {y})** - Size: {w}×{h}px - Ratio: {v.contrast_ratio:.2f}:1\n")
             
             if violations > 10:
-                content += f"\n*...and {violations - 10} more violations*\n"
+                parts.append(f"\n*...and {violations - 10} more violations*\n")
         else:
-            content += "\nNo significant contrast violations detected. The interface maintains readable text throughout.\n"
+            parts.append("\nNo significant contrast violations detected. The interface maintains readable text throughout.\n")
         
-        content += """
-
-### User Impact
-Low contrast affects:
-- Users with low vision or color blindness
-- Users in bright sunlight or poor lighting
-- Older users with age-related vision changes
-- All users experiencing screen glare
-
-### Recommendations
-- Increase foreground/background color difference
-- Use darker text on light backgrounds (or vice versa)
-- Test with color blindness simulators
-- Avoid relying solely on color to convey information
-"""
+        parts.append(_CONTRAST_FOOTER)
         
         return LLMReportSection(
             title="Contrast Analysis",
-            content=content,
+            content="".join(parts),
             severity=severity
         )
     
-    def _generate_dark_pattern_analysis(self, result: "PipelineResult") -> LLMReportSection:
+    def _generate_dark_pattern_analysis(
+        self, result: "PipelineResult", llm_response: Optional[str] = None
+    ) -> LLMReportSection:
         """Generate ethical UX and dark pattern analysis."""
         dp = result.dark_patterns
         flags = len(dp.flags)
         
-        severity = "critical" if dp.score < 0.5 else "warning" if dp.score < 0.8 else "info"
+        level = bisect_right(_SCORE_THRESHOLDS, dp.score)
+        severity = _SEVERITY_LEVELS[level]
         
         # Get LLM analysis if available
         llm_insights = ""
         if self.llm_analyzer:
             try:
-                flags_data = [
-                    {
-                        "label": f.label,
-                        "text": f.text[:200],  # Truncate long text
-                        "score": f.score
-                    }
-                    for f in dp.flags[:15]  # Top 15 flags
-                ]
-                llm_response = self.llm_analyzer.analyze_dark_patterns(
-                    flags=flags_data,
-                    score=dp.score
-                )
+                if llm_response is None:
+                    llm_response = self.llm_analyzer.analyze_dark_patterns(
+                        **self._llm_section_requests(result)["dark_patterns"]
+                    )
                 llm_insights = f"\n\n### LLM Ethical Assessment\n\n{llm_response}\n"
             except Exception as e:
                 print(f"Warning: LLM analysis failed: {e}")
         
-        content = f"""
+        parts = [f"""
 ## Ethical UX & Dark Pattern Analysis
 
 **Ethical UX Score**: {dp.score:.2%} | **Potential Dark Patterns**: {flags}
@@ -438,57 +634,49 @@ Dark patterns are deceptive design techniques that manipulate users into taking
 such as subscribing to services, sharing personal data, or making purchases.
 
 ### Assessment
-{"🔴 CRITICAL: Multiple manipulative design patterns detected. The interface may violate user trust and consent principles." if dp.score < 0.5 else
- "⚠️ WARNING: Some potentially manipulative design elements identified. Review for ethical compliance." if dp.score < 0.8 else
- "✅ GOOD: The interface demonstrates ethical design practices with minimal concerning patterns."}
+{_DARK_PATTERN_ASSESSMENT[level]}
 {llm_insights}
-"""
+"""]
         
         if flags > 0:
-            content += "### Detected Patterns\n\n"
+            parts.append("### Detected Patterns\n\n")
             
-            by_label = {}
+            # Totals per label, keeping only the first 5 flags of each
+            label_counts = Counter()
+            shown_by_label: dict[str, list] = {}
             for flag in dp.flags:
-                by_label.setdefault(flag.label, []).append(flag)
+                label_counts[flag.label] += 1
+                shown = shown_by_label.setdefault(flag.label, [])
+                if len(shown) < 5:
+                    shown.append(flag)
             
-            for label, instances in by_label.items():
-                content += f"#### {label} ({len(instances)} instance{'s' if len(instances) > 1 else ''})\n\n"
+            for label, shown in shown_by_label.items():
+                instances = label_counts[label]
+                parts.append(f"#### {label} ({instances} instance{'s' if instances > 1 else ''})\n\n")
                 
                 # Explain the pattern
-                explanations = {
-                    "Urgency": "Creates artificial time pressure to rush user decisions",
-                    "Confirm-shaming": "Uses guilt or shame to manipulate user choices",
-                    "Misdirection": "Directs attention away from important information or choices",
-                }
-                content += f"*{explanations.get(label, 'Manipulative design element')}*\n\n"
+                parts.append(f"*{_PATTERN_EXPLANATIONS.get(label, 'Manipulative design element')}*\n\n")
                 
-                for i, flag in enumerate(instances[:5], 1):
-                    content += f"{i}. **Confidence: {flag.score:.0%}**\n"
-                    content += f"   - Text: \"{flag.text[:150]}{'...' if len(flag.text) > 150 else ''}\"\n\n"
+                for i, flag in enumerate(shown, 1):
+                    parts.append(f"{i}. **Confidence: {flag.score:.0%}**\n")
+                    parts.append(f"   - Text: \"{flag.text[:150]}{'...' if len(flag.text) > 150 else ''}\"\n\n")
                 
-                if len(instances) > 5:
-                    content += f"*...and {len(instances) - 5} more instances*\n\n"
+                if instances > 5:
+                    parts.append(f"*...and {instances - 5} more instances*\n\n")
         else:
-            content += "### No Dark Patterns Detected\n\nThe interface text does not contain obvious manipulative language patterns.\n"
+            parts.append("### No Dark Patterns Detected\n\nThe interface text does not contain obvious manipulative language patterns.\n")
         
-        content += """
-
-### Ethical Design Principles
-A trustworthy interface should:
-- Respect user autonomy and informed consent
-- Be transparent about costs, commitments, and data usage
-- Make it easy to cancel, unsubscribe, or delete accounts
-- Avoid pressuring users with artificial urgency
-- Present choices clearly without guilt or shame
-"""
+        parts.append(_ETHICS_FOOTER)
         
         return LLMReportSection(
             title="Dark Pattern Analysis",
-            content=content,
+            content="".join(parts),
             severity=severity
         )
     
-    def _generate_recommendations(self, result: "PipelineResult") -> LLMReportSection:
+    def _generate_recommendations(
+        self, result: "PipelineResult", llm_response: Optional[str] = None
+    ) -> LLMReportSection:
         """Generate actionable recommendations."""
         recommendations = []
         
@@ -531,60 +719,37 @@ A trustworthy interface should:
         llm_recommendations = ""
         if self.llm_analyzer:
             try:
-                audit_summary = {
-                    "accessibility_score": result.accessibility.score if result.accessibility else None,
-                    "accessibility_violations": len(result.accessibility.violations) if result.accessibility else 0,
-                    "contrast_avg": result.contrast.average_contrast,
-                    "contrast_violations": len(result.contrast.violations),
-                    "dark_patterns_score": result.dark_patterns.score,
-                    "dark_patterns_count": len(result.dark_patterns.flags),
-                    "fairness_score": result.fairness.value
-                }
-                llm_response = self.llm_analyzer.generate_recommendations(audit_summary)
+                if llm_response is None:
+                    llm_response = self.llm_analyzer.generate_recommendations(
+                        **self._llm_section_requests(result)["recommendations"]
+                    )
                 llm_recommendations = f"\n\n### LLM Recommendations\n\n{llm_response}\n"
             except Exception as e:
                 print(f"Warning: LLM recommendations failed: {e}")
         
-        content = "## Actionable Recommendations\n\n"
+        parts = ["## Actionable Recommendations\n\n"]
         
         # Add LLM recommendations first if available
         if llm_recommendations:
-            content += llm_recommendations
-            content += "\n### Rule-Based Recommendations\n\n"
+            parts.append(llm_recommendations)
+            parts.append("\n### Rule-Based Recommendations\n\n")
         
         for i, rec in enumerate(recommendations, 1):
-            content += f"### {i}. [{rec['priority']}] {rec['area']}\n\n"
-            content += f"**Action**: {rec['action']}\n\n"
-            content += f"**Impact**: {rec['impact']}\n\n"
+            parts.append(f"### {i}. [{rec['priority']}] {rec['area']}\n\n")
+            parts.append(f"**Action**: {rec['action']}\n\n")
+            parts.append(f"**Impact**: {rec['impact']}\n\n")
         
-        content += """
-### Implementation Strategy
-
-1. **Quick Wins (1-2 weeks)**
-   - Fix critical accessibility violations
-   - Adjust color contrast for key text elements
-   - Remove obvious dark pattern language
-
-2. **Medium Term (1-2 months)**
-   - Full WCAG audit and remediation
-   - Redesign low-contrast UI components
-   - Establish ethical design guidelines
-
-3. **Long Term (Ongoing)**
-   - Regular accessibility audits
-   - User testing with diverse populations
-   - Continuous monitoring of design patterns
-"""
+        parts.append(_STRATEGY_FOOTER)
         
         return LLMReportSection(
             title="Recommendations",
-            content=content,
+            content="".join(parts),
             severity="info"
         )
     
     def _generate_technical_details(self, result: "PipelineResult") -> LLMReportSection:
         """Generate technical audit details."""
-        content = f"""
+        parts = [f"""
 ## Technical Audit Details
 
 ### Scoring Methodology
@@ -597,24 +762,24 @@ A trustworthy interface should:
 
 ### Component Scores
 
-"""
+"""]
         
         if result.accessibility:
-            content += f"""
+            parts.append(f"""
 | Component | Score | Weight | Contribution |
 |-----------|-------|--------|--------------|
 | Accessibility | {result.accessibility.score:.3f} | {result.fairness.alpha} | {(result.accessibility.score * result.fairness.alpha):.3f} |
 | Ethical UX | {result.dark_patterns.score:.3f} | {result.fairness.beta} | {(result.dark_patterns.score * result.fairness.beta):.3f} |
-"""
+""")
         else:
-            content += f"""
+            parts.append(f"""
 | Component | Score | Weight | Contribution |
 |-----------|-------|--------|--------------|
 | Accessibility | N/A | {result.fairness.alpha} | N/A |
 | Ethical UX | {result.dark_patterns.score:.3f} | {result.fairness.beta} | {(result.dark_patterns.score * result.fairness.beta):.3f} |
-"""
+""")
         
-        content += f"""
+        parts.append(f"""
 
 ### Audit Artifacts
 
@@ -628,43 +793,33 @@ A trustworthy interface should:
 - **Contrast Detection**: OpenCV with WCAG luminance calculations
 - **Dark Patterns**: {"Transformer NLP model" if result.dark_patterns.raw_outputs else "Keyword heuristics"}
 - **Reporting**: Rule-based templates with optional LLM insights
-
-### Limitations
-
-- Automated tools catch ~30-40% of accessibility issues; manual testing required
-- Contrast detection uses heuristics; manual review of flagged regions recommended
-- Dark pattern detection based on text analysis; visual deception not captured
-- Screenshot-only mode cannot perform full accessibility audits
-"""
+""")
+        parts.append(_LIMITATIONS)
         
         return LLMReportSection(
             title="Technical Details",
-            content=content,
+            content="".join(parts),
             severity="info"
         )
     
-    def _format_report(self, sections: list[LLMReportSection]) -> str:
-        """Format all sections into final report."""
-        report = "# Design Fairness Audit Report\n\n"
-        report += "*Generated by Design Fairness Assistant*\n\n"
-        report += "---\n\n"
+    def _format_report(
+        self, sections: list[LLMReportSection], out: Optional[TextIO] = None
+    ) -> Optional[str]:
+        """Format all sections into final report.
+        
+        Returns the report, or writes it to ``out`` and returns ``None``.
+        """
+        parts = ["# Design Fairness Audit Report\n\n"]
+        parts.append("*Generated by Design Fairness Assistant*\n\n")
+        parts.append("---\n\n")
         
         for section in sections:
-            report += section.content + "\n\n---\n\n"
+            parts.append(section.content)
+            parts.append("\n\n---\n\n")
         
-        report += """
-## About This Report
-
-This audit was generated using:
-- Automated accessibility testing (axe-core)
-- Computer vision for contrast analysis (OpenCV)
-- Keyword-based dark pattern detection
-- Rule-based report templates with optional Gemini LLM integration
-
-**Note**: Narrative explanations use rule-based templates derived from audit results.
-When a Gemini API key is configured, additional LLM-generated insights are included.
-
-For questions or to request a manual accessibility audit, please consult with accessibility experts.
-"""
+        parts.append(_ABOUT_FOOTER)
         
-        return report
+        if out is not None:
+            out.writelines(parts)
+            return None
+        return "".join(parts)
@@ -1,6 +1,7 @@
 """High-level orchestration logic for the design fairness assistant."""
 from __future__ import annotations
 
+import logging
 from dataclasses import dataclass, replace
 from enum import Enum
 from pathlib import Path
@@ -27,9 +28,11 @@ except ImportError:  # pragma: no cover
     RemediationReport = None
 
 try:
-    from .llm_integration import LLMAnalyzer
+    from .llm_integration import get_llm_analyzer
 except ImportError:  # pragma: no cover - optional dependency
-    LLMAnalyzer = None
+    get_llm_analyzer = None
+
+logger = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
     try:
@@ -108,11 +111,11 @@ class DesignAssistant:
         self.enable_agentic = enable_agentic and AgenticAuditor is not None
         self.enable_remediation = enable_remediation and RemediationEngine is not None
 
-        if llm_config and LLMAnalyzer is not None:
+        if llm_config and get_llm_analyzer is not None:
             try:
-                self.llm_analyzer = LLMAnalyzer(llm_config)
+                self.llm_analyzer = get_llm_analyzer(llm_config)
             except Exception as exc:  # pragma: no cover
-                print(f"DEBUG: Failed to initialize LLMAnalyzer: {exc}")
+                logger.warning("Failed to initialize LLMAnalyzer: %s", exc)
                 self.llm_analyzer = None
 
         # Agentic auditor
@@ -145,7 +148,6 @@ class DesignAssistant:
         try:
             original_screenshot_path = output_dir / "original_screenshot.png"
             if hasattr(screenshot, 'image') and screenshot.image is not None:
-                from PIL import Image
                 if hasattr(screenshot.image, 'save'):
                     screenshot.image.save(original_screenshot_path)
                 else:
@@ -230,7 +232,7 @@ class DesignAssistant:
             try:
                 agentic_report = self._run_agentic_audit(value)
             except Exception as exc:
-                print(f"DEBUG: Agentic audit failed: {exc}")
+                logger.warning("Agentic audit failed: %s", exc)
 
         # --- LLM validation ---
         llm_analysis: Optional[dict] = None
@@ -286,7 +288,7 @@ class DesignAssistant:
                         },
                     )
             except Exception as exc:
-                print(f"DEBUG: Remediation generation failed: {exc}")
+                logger.warning("Remediation generation failed: %s", exc)
 
         # --- Build artifacts ---
         analysis_images = self._save_analysis_images(
@@ -328,18 +330,16 @@ class DesignAssistant:
 
     def _run_agentic_audit(self, url: str) -> Any:
         """Spin up a short-lived Selenium session for agentic interaction."""
-        from .collectors.selenium_collector import SeleniumCollector
-
-        collector = SeleniumCollector()
-        driver = collector.driver_factory()
+        # Reuses the collector's driver pool when one is configured
+        collector = self.selenium_collector
+        driver = collector.acquire_driver()
         try:
             driver.set_page_load_timeout(30)
             driver.get(url)
-            import time
-            time.sleep(2)
+            collector.wait_for_load(driver)
             return self.agentic_auditor.audit(driver)
         finally:
-            driver.quit()
+            collector.release_driver(driver, visited=(url,))
 
     def _collect_from_url(self, url: str, output_dir: Path) -> SeleniumArtifacts:
         collector_result = self.selenium_collector.collect(url, output_dir=output_dir)
@@ -5,11 +5,6 @@ import textwrap
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 
-try:
-    import google.generativeai as genai
-except ImportError:
-    genai = None
-
 
 @dataclass(frozen=True)
 class RemediationSuggestion:
@@ -63,7 +58,13 @@ class RemediationEngine:
         self._model = None
         self._config = llm_config
 
-        if genai is not None and llm_config and getattr(llm_config, "api_key", None):
+        if llm_config and getattr(llm_config, "api_key", None):
+            # Imported here so the pipeline does not load the Gemini SDK
+            # unless remediation is actually configured.
+            try:
+                import google.generativeai as genai
+            except ImportError:
+                return
             try:
                 genai.configure(api_key=llm_config.api_key)
                 model_name = getattr(llm_config, "model", "models/gemini-2.5-pro")
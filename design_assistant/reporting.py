@@ -1,6 +1,7 @@
 """Report generation utilities (PDF, JSON, and Markdown)."""
 from __future__ import annotations
 
+import hashlib
 import json
 import re
 from dataclasses import dataclass
@@ -43,9 +44,7 @@ class MarkdownReportWriter:
     def write(self, result: "PipelineResult", path: Path) -> Path:
         path.parent.mkdir(parents=True, exist_ok=True)
         generator = LLMReportGenerator(llm_config=self.llm_config)
-        report_content = generator.generate_comprehensive_report(result)
-        path.write_text(report_content, encoding="utf-8")
-        return path
+        return generator.write_comprehensive_report(result, path)
 
 
 @dataclass
@@ -54,6 +53,7 @@ class PDFReportWriter:
 
     title: str = "Design Fairness Audit Report"
     llm_config: Optional[object] = None
+    reuse_unchanged: bool = True
     _image_pattern = re.compile(r"!\[(?P<alt>.*?)\]\((?P<src>.*?)\)")
 
     def write(self, result: "PipelineResult", path: Path) -> Optional[Path]:
@@ -61,9 +61,63 @@ class PDFReportWriter:
             return None
 
         path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Generate markdown report first
+
+        # Skip the ReportLab build when the same audit was already rendered here
         generator = LLMReportGenerator(llm_config=self.llm_config)
+        hash_path = path.with_name(path.name + ".hash")
+        fingerprint = self._fingerprint(result, generator.llm_available())
+        if self.reuse_unchanged and path.exists() and hash_path.exists():
+            try:
+                if hash_path.read_text(encoding="utf-8").strip() == fingerprint:
+                    return path
+            except OSError:
+                pass
+
+        written, complete = self._build(result, path, generator)
+        # Only a full build is reusable; a fallback PDF is retried next time
+        try:
+            if complete:
+                hash_path.write_text(fingerprint, encoding="utf-8")
+            else:
+                hash_path.unlink(missing_ok=True)
+        except OSError:
+            pass
+        return written
+
+    def _fingerprint(self, result: "PipelineResult", llm_enabled: bool) -> str:
+        """Hash the inputs that determine the PDF content."""
+        artifacts = getattr(result, "artifacts", {}) or {}
+        input_value = artifacts.get("url") or str(artifacts.get("screenshot_path", ""))
+        fairness = result.fairness
+        accessibility = result.accessibility
+        accessibility_ids = (accessibility.score,) + tuple(
+            (v.violation_id, v.impact, v.description, v.help_url, tuple(v.nodes))
+            for v in accessibility.violations
+        ) if accessibility else ()
+        contrast_ids = tuple(
+            (v.bbox, v.contrast_ratio, v.description) for v in result.contrast.violations
+        )
+        flag_ids = tuple((f.label, f.score, f.text) for f in result.dark_patterns.flags)
+        key = (
+            self.title,
+            llm_enabled,
+            input_value,
+            fairness.alpha,
+            fairness.beta,
+            fairness.value,
+            result.contrast.average_contrast,
+            result.dark_patterns.score,
+            accessibility_ids,
+            contrast_ids,
+            flag_ids,
+        )
+        return hashlib.blake2b(repr(key).encode("utf-8"), digest_size=16).hexdigest()
+
+    def _build(
+        self, result: "PipelineResult", path: Path, generator: LLMReportGenerator
+    ) -> tuple[Path, bool]:
+        """Render the PDF; the flag is False when the LLM or ReportLab build fell back."""
+        # Generate markdown report first
         markdown_content = generator.generate_comprehensive_report(result)
         
         # Convert markdown to PDF-friendly format
@@ -147,13 +201,13 @@ class PDFReportWriter:
         
         try:
             doc.build(elements)
-            return path
+            return path, not generator.llm_fallback
         except Exception as e:
             # Log the error with details
             print(f"PDF generation error: {e}")
             print(f"Error type: {type(e).__name__}")
             # Fallback to simple summary if PDF generation fails
-            return self._write_simple_summary(result, path)
+            return self._write_simple_summary(result, path), False
     
     def _convert_markdown_to_html(self, text: str) -> str:
         """Convert markdown formatting to proper HTML tags for ReportLab."""
@@ -49,3 +49,22 @@ def test_contrast_score_normalised():
     image = _make_panel(100)
     report = auditor.audit(image)
     assert 0.0 <= report.contrast_score <= 1.0
+
+
+def test_ring_means_match_surrounding_background():
+    auditor = ContrastAuditor(padding=4)
+    image = _make_panel(0)
+    luminance = auditor._luminance_map(image)
+    sat = cv2.integral(luminance)
+    bboxes = np.array(
+        [
+            (60, 50, 40, 20),  # strictly inside the dark rectangle: ring is dark
+            (40, 40, 161, 41),  # covering the rectangle exactly: ring is the light background
+            (0, 0, 240, 120),  # covering the full image leaves no ring
+        ],
+        dtype=np.int32,
+    )
+    rings = auditor._ring_means(sat, bboxes)
+    assert rings[0] < 0.05
+    assert abs(rings[1] - 200 / 255.0) < 1e-4
+    assert np.isnan(rings[2])
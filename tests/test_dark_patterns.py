@@ -0,0 +1,133 @@
+import re
+
+import pytest
+
+from design_assistant.audits.dark_patterns import DarkPatternAuditor, DarkPatternFlag
+
+PAGE_TEXT = (
+    "Hurry, this limited time offer ends at midnight tonight! "
+    "Our team ships every order within two business days. "
+    "No thanks, I don't want to save money on my groceries. "
+    "A short line. "
+    "The recommended plan is preselected for you at checkout. "
+    "Read our guide to choosing the right running shoes."
+)
+
+
+class StubClassifier:
+    """Labels a sentence by keyword so results are deterministic and order-sensitive."""
+
+    def __init__(self, fail_batches: bool = False):
+        self.fail_batches = fail_batches
+        self.seen = []
+
+    def __call__(self, inputs, batch_size=None, **params):
+        if isinstance(inputs, list):
+            if self.fail_batches:
+                raise RuntimeError("batch failed")
+            return [self._predict(text) for text in inputs]
+        return [self._predict(inputs)]
+
+    def _predict(self, text):
+        self.seen.append(text)
+        lower = text.lower()
+        if "hurry" in lower:
+            return {"label": "LABEL_Urgency", "score": 0.9}
+        if "no thanks" in lower:
+            return {"label": "Confirm-shaming", "score": 0.4}
+        if "preselected" in lower:
+            return {"label": "Misdirection", "score": 0.7}
+        return {"label": "Neutral", "score": 0.99}
+
+
+def _auditor(classifier, **kwargs):
+    auditor = DarkPatternAuditor(**kwargs)
+    auditor._classifier = classifier
+    return auditor
+
+
+def _per_sentence_flags(auditor, classifier, text):
+    """The original unbatched loop: one classifier call per sentence, in order."""
+    flags = []
+    for sentence in auditor._split_text(text):
+        top = classifier(sentence)[0]
+        label = top["label"].replace("LABEL_", "").strip()
+        if label in auditor.labels and top["score"] >= auditor.threshold:
+            flags.append(DarkPatternFlag(label=label, score=top["score"], text=sentence))
+    return flags
+
+
+def test_batched_flags_match_per_sentence_path():
+    auditor = _auditor(StubClassifier(), keyword_gate=False, batch_size=2)
+    report = auditor.audit(PAGE_TEXT)
+
+    assert report.flags == _per_sentence_flags(auditor, StubClassifier(), PAGE_TEXT)
+    assert [flag.label for flag in report.flags] == ["Urgency", "Misdirection"]
+
+
+def test_classify_returns_results_in_input_order():
+    auditor = _auditor(StubClassifier(), keyword_gate=False)
+    sentences = auditor._split_text(PAGE_TEXT)
+    assert sorted(sentences, key=len) != sentences
+
+    results = auditor._classify(sentences)
+
+    assert results == [StubClassifier()._predict(sentence) for sentence in sentences]
+    report = auditor.audit(PAGE_TEXT)
+    assert [entry["sentence"] for entry in report.raw_outputs] == sentences
+
+
+def test_failed_batch_falls_back_to_single_sentences():
+    auditor = _auditor(StubClassifier(fail_batches=True), keyword_gate=False)
+    report = auditor.audit(PAGE_TEXT)
+
+    assert report.flags == _per_sentence_flags(auditor, StubClassifier(), PAGE_TEXT)
+
+
+def test_keyword_automaton_matches_substring_scan():
+    pytest.importorskip("ahocorasick")
+    auditor = DarkPatternAuditor()
+    scan = DarkPatternAuditor()
+    scan._keyword_automaton = None
+    sentences = [
+        "Hurry, act now: this limited time deal is selling fast!",
+        "The recommended plan with auto-renew is preselected by default.",
+        "Are you sure? You'll regret it, and only a few left at this price.",
+        "We publish our shipping rates on the delivery page.",
+        "",
+    ]
+
+    for sentence in sentences:
+        assert auditor._heuristic_score(sentence) == scan._heuristic_score(sentence)
+        assert auditor._has_keyword(sentence.lower()) == scan._has_keyword(sentence.lower())
+
+
+def test_sentence_split_matches_lookbehind_split():
+    text = "Wait... what?! Really.  Yes!\nNo trailing punctuation here\tand more. End"
+    auditor = DarkPatternAuditor()
+
+    expected = [part.strip() for part in re.split(r"(?<=[.!?])\s+", text)]
+    assert list(auditor._iter_sentences(text)) == expected
+
+
+def test_keyword_gate_keeps_plain_sentences_from_the_model():
+    classifier = StubClassifier()
+    auditor = _auditor(classifier)
+    report = auditor.audit(PAGE_TEXT)
+
+    sentences = auditor._split_text(PAGE_TEXT)
+    gated = [sentence for sentence in sentences if auditor._has_keyword(sentence.lower())]
+    assert 0 < len(gated) < len(sentences)
+    assert sorted(classifier.seen) == sorted(gated)
+    assert [entry["sentence"] for entry in report.raw_outputs] == gated
+    assert [flag.label for flag in report.flags] == ["Urgency", "Misdirection"]
+
+
+def test_keyword_gate_skips_the_model_without_candidates():
+    classifier = StubClassifier()
+    auditor = _auditor(classifier)
+    report = auditor.audit("Our team ships every order within two business days.")
+
+    assert classifier.seen == []
+    assert report.score == 1.0
+    assert report.flags == []
@@ -0,0 +1,89 @@
+from design_assistant.llm_integration import (
+    ROWS_TOKEN_BUDGET,
+    LLMAnalyzer,
+    LLMConfig,
+    _find_json_object,
+    _fmt_dark_pattern,
+    _prompt_rows,
+)
+
+
+def _analyzer():
+    return LLMAnalyzer(LLMConfig(api_key=None))
+
+
+def test_find_json_object_ignores_braces_inside_strings():
+    text = 'Result: {"summary": "use {braces} and } carefully", "score": 2} trailing }'
+    assert _find_json_object(text) == {"summary": "use {braces} and } carefully", "score": 2}
+
+
+def test_find_json_object_handles_escaped_quotes():
+    text = r'Note {"quote": "she said \"hi {there}\"", "ok": true} done'
+    assert _find_json_object(text) == {"quote": 'she said "hi {there}"', "ok": True}
+
+
+def test_find_json_object_skips_unparseable_candidates():
+    text = "Use {placeholders} like this, then {\"a\": {\"b\": 1}}"
+    assert _find_json_object(text) == {"a": {"b": 1}}
+
+
+def test_find_json_object_missing_or_unbalanced():
+    assert _find_json_object("no object here") is None
+    assert _find_json_object('{"a": {"b": 1}') is None
+    assert _find_json_object('{"a": "unterminated}') is None
+
+
+def test_parse_json_response_strips_fences():
+    analyzer = _analyzer()
+    assert analyzer._parse_json_response('```json\n{"a": "}"}\n```') == {"a": "}"}
+    assert analyzer._parse_json_response('Here it is:\n```json\n{"a": 1}\n```\nThanks') == {"a": 1}
+    assert analyzer._parse_json_response("```json\n[1, 2]\n```") is None
+
+
+def test_find_json_object_never_returns_nested_fragments():
+    assert _find_json_object("{'a': {\"b\": 1}} then {\"c\": 2}") == {"c": 2}
+
+
+def _flag(text, label="Urgency", score=0.9):
+    return {"label": label, "score": score, "text": text}
+
+
+def test_prompt_rows_stops_at_limit():
+    flags = [_flag(f"offer {index} ends soon") for index in range(12)]
+    rows = _prompt_rows(flags, _fmt_dark_pattern, 5).splitlines()
+    assert rows == [_fmt_dark_pattern(flag) for flag in flags[:5]]
+
+
+def test_prompt_rows_stops_at_token_budget():
+    row_tokens = ROWS_TOKEN_BUDGET // 3 + 1
+    items = [f"row{index} " + " ".join(["word"] * (row_tokens - 1)) for index in range(10)]
+    rows = _prompt_rows(items, str, 10).splitlines()
+    assert rows == items[:2]
+
+    # The first row is always kept, even when it alone exceeds the budget
+    oversized = " ".join(["word"] * (ROWS_TOKEN_BUDGET + 1))
+    assert _prompt_rows([oversized, "next"], str, 10) == oversized
+
+
+def test_prompt_counts_come_from_total_count():
+    analyzer = _analyzer()
+    flags = [_flag(f"offer {index} ends soon") for index in range(5)]
+    prompt = analyzer._build_dark_pattern_prompt(flags, 0.4, total_count=37)
+    assert "Count of Flagged Patterns: 37" in prompt
+    assert "offer 4 ends soon" in prompt
+
+    prompt = analyzer._build_dark_pattern_prompt(flags, 0.4)
+    assert "Count of Flagged Patterns: 5" in prompt
+
+
+def test_prompt_rows_lists_duplicates_once():
+    flags = [_flag("Only 2 left in stock!")] * 3 + [_flag("Offer ends tonight")] + [_flag("Only 2 left in stock!")]
+    rows = _prompt_rows(flags, _fmt_dark_pattern, 5).splitlines()
+    assert rows == [
+        _fmt_dark_pattern(flags[0]),
+        _fmt_dark_pattern(flags[3]),
+        "(+3 repeats of the rows above)",
+    ]
+    # Repeats do not use up the row limit
+    assert _prompt_rows(flags, _fmt_dark_pattern, 2).splitlines() == rows
+    assert "repeats" not in _prompt_rows(flags[2:4], _fmt_dark_pattern, 5)
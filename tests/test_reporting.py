@@ -0,0 +1,123 @@
+from dataclasses import replace
+
+from design_assistant import reporting
+from design_assistant.audits.accessibility import AccessibilityReport, AccessibilityViolation
+from design_assistant.audits.contrast import ContrastReport, ContrastViolation
+from design_assistant.audits.dark_patterns import DarkPatternFlag, DarkPatternReport
+from design_assistant.fusion import DesignFairnessScore
+from design_assistant.llm_reporter import LLMReportGenerator
+from design_assistant.pipeline import PipelineResult
+from design_assistant.reporting import PDFReportWriter
+
+
+def _result(contrast_ratio: float = 2.1) -> PipelineResult:
+    return PipelineResult(
+        accessibility=AccessibilityReport(
+            score=0.8,
+            violations=[AccessibilityViolation("image-alt", "critical", "Images need alt text", None, [])],
+            raw_results=None,
+        ),
+        contrast=ContrastReport(
+            average_contrast=4.0,
+            violations=[ContrastViolation(bbox=(10, 20, 30, 40), contrast_ratio=contrast_ratio)],
+        ),
+        dark_patterns=DarkPatternReport(
+            score=0.9,
+            flags=[DarkPatternFlag(label="Urgency", score=0.8, text="Hurry, offer ends soon")],
+            raw_outputs=None,
+        ),
+        fairness=DesignFairnessScore.from_components(
+            accessibility_score=0.8, ethical_score=0.9, contrast_score=0.6
+        ),
+        artifacts={"url": "https://example.com"},
+    )
+
+
+class CountingPDFWriter(PDFReportWriter):
+    """Records builds instead of rendering with ReportLab."""
+
+    def __init__(self, complete: bool = True):
+        super().__init__()
+        self.builds = 0
+        self.complete = complete
+
+    def _build(self, result, path, generator):
+        self.builds += 1
+        path.write_text(f"build {self.builds}", encoding="utf-8")
+        return path, self.complete
+
+
+def test_pdf_reused_when_result_unchanged(tmp_path, monkeypatch):
+    monkeypatch.setattr(reporting, "SimpleDocTemplate", object())
+    writer = CountingPDFWriter()
+    path = tmp_path / "audit.pdf"
+
+    assert writer.write(_result(), path) == path
+    assert writer.write(_result(), path) == path
+
+    assert writer.builds == 1
+    assert path.read_text(encoding="utf-8") == "build 1"
+    assert path.with_name("audit.pdf.hash").exists()
+
+
+def test_pdf_rebuilt_when_result_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(reporting, "SimpleDocTemplate", object())
+    writer = CountingPDFWriter()
+    path = tmp_path / "audit.pdf"
+    result = _result()
+
+    violation = result.accessibility.violations[0]
+    new_nodes = replace(result.accessibility, violations=[replace(violation, nodes=["<img src=a.png>"])])
+
+    writer.write(result, path)
+    writer.write(_result(contrast_ratio=1.5), path)
+    writer.write(replace(result, dark_patterns=replace(result.dark_patterns, score=0.5)), path)
+    writer.write(replace(result, accessibility=new_nodes), path)
+
+    assert writer.builds == 4
+    assert path.read_text(encoding="utf-8") == "build 4"
+
+    writer.reuse_unchanged = False
+    writer.write(result, path)
+    assert writer.builds == 5
+
+
+def test_fallback_pdf_is_not_reused(tmp_path, monkeypatch):
+    monkeypatch.setattr(reporting, "SimpleDocTemplate", object())
+    writer = CountingPDFWriter()
+    path = tmp_path / "audit.pdf"
+    hash_path = path.with_name("audit.pdf.hash")
+
+    writer.write(_result(), path)
+    assert hash_path.exists()
+
+    # A degraded build drops the stale sidecar, and is itself retried
+    writer.write(_result(contrast_ratio=1.5), path)
+    writer.complete = False
+    writer.write(_result(), path)
+    assert not hash_path.exists()
+    writer.write(_result(), path)
+    assert writer.builds == 4
+
+
+class FailingAnalyzer:
+    """Available LLM whose comprehensive analysis always errors."""
+
+    def is_available(self):
+        return True
+
+    def analyze_comprehensive(self, **kwargs):
+        return "Error: quota exceeded"
+
+
+def test_generator_flags_llm_fallback():
+    generator = LLMReportGenerator()
+    assert not generator.llm_available()
+    generator.generate_comprehensive_report(_result())
+    assert generator.llm_fallback is False
+
+    generator.llm_analyzer = FailingAnalyzer()
+    assert generator.llm_available()
+    report = generator.generate_comprehensive_report(_result())
+    assert generator.llm_fallback is True
+    assert "Executive Summary" in report
@@ -0,0 +1,75 @@
+import base64
+
+import cv2
+import numpy as np
+import pytest
+
+from design_assistant.collectors.screenshot_loader import ScreenshotLoader
+
+
+def _png_bytes(width: int = 8, height: int = 6) -> bytes:
+    image = np.zeros((height, width, 3), dtype=np.uint8)
+    image[:, : width // 2] = (255, 0, 0)
+    ok, encoded = cv2.imencode(".png", image)
+    assert ok
+    return encoded.tobytes()
+
+
+def test_scaled_payload_is_persisted_at_returned_size(tmp_path):
+    loader = ScreenshotLoader(scale=0.5)
+    path = tmp_path / "shot.png"
+
+    artifacts = loader.load_from_bytes(_png_bytes(), output_path=path)
+
+    assert artifacts.image.shape[:2] == (3, 4)
+    assert np.array_equal(cv2.imread(str(path)), artifacts.image)
+
+
+def test_png_payload_is_written_without_reencoding(tmp_path):
+    payload = _png_bytes()
+    path = tmp_path / "shot.png"
+
+    artifacts = ScreenshotLoader().load_from_bytes(payload, output_path=path)
+
+    assert path.read_bytes() == payload
+    assert artifacts.image.shape == (6, 8, 3)
+
+
+def test_payload_is_reencoded_for_other_formats(tmp_path):
+    path = tmp_path / "shot.jpg"
+    ScreenshotLoader().load_from_bytes(_png_bytes(), output_path=path)
+
+    assert path.read_bytes().startswith(b"\xff\xd8\xff")
+
+
+def test_persist_false_writes_nothing(tmp_path):
+    path = tmp_path / "nested" / "shot.png"
+    artifacts = ScreenshotLoader().load_from_bytes(_png_bytes(), output_path=path, persist=False)
+
+    assert artifacts.path == path
+    assert artifacts.image.shape == (6, 8, 3)
+    assert not path.parent.exists()
+
+
+def test_load_from_base64_accepts_plain_and_data_uri(tmp_path):
+    payload = _png_bytes()
+    encoded = base64.b64encode(payload).decode("ascii")
+    loader = ScreenshotLoader()
+
+    plain = loader.load_from_base64(encoded, output_path=tmp_path / "plain.png")
+    data_uri = loader.load_from_base64(
+        f"data:image/png;base64,{encoded}", output_path=tmp_path / "uri.png"
+    )
+    as_bytes = loader.load_from_base64(encoded.encode("ascii"), output_path=tmp_path / "bytes.png")
+
+    for artifacts in (plain, data_uri, as_bytes):
+        assert artifacts.path.read_bytes() == payload
+        assert np.array_equal(artifacts.image, plain.image)
+
+
+def test_load_from_base64_rejects_invalid_payload(tmp_path):
+    loader = ScreenshotLoader()
+    with pytest.raises(ValueError):
+        loader.load_from_base64("abc", output_path=tmp_path / "shot.png")
+    with pytest.raises(ValueError):
+        loader.load_from_base64(base64.b64encode(b"not an image"), output_path=tmp_path / "shot.png")
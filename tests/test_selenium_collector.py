@@ -0,0 +1,157 @@
+import json
+import threading
+
+import cv2
+import numpy as np
+
+from design_assistant.collectors import selenium_collector
+from design_assistant.collectors.selenium_collector import DriverPool, SeleniumCollector
+
+
+class FakeDriver:
+    """Minimal WebDriver stand-in without CDP, so screenshots are stitched."""
+
+    def __init__(self):
+        self.quit_calls = 0
+        self.visited = []
+
+    def set_page_load_timeout(self, timeout):
+        pass
+
+    @property
+    def current_url(self):
+        return self.visited[-1] if self.visited else "data:,"
+
+    def get(self, url):
+        self.visited.append(url)
+
+    def execute_script(self, script):
+        if "XMLSerializer" in script:
+            return json.dumps({"html": "<html><body>Hello</body></html>", "text": "Hello"})
+        if "scrollHeight" in script:
+            return [40, 30, 40, 30]
+        return None
+
+    def execute_async_script(self, script):
+        return True
+
+    def set_window_size(self, width, height):
+        pass
+
+    def get_window_size(self):
+        return {"width": 40, "height": 30}
+
+    def delete_all_cookies(self):
+        pass
+
+    def get_screenshot_as_png(self):
+        ok, encoded = cv2.imencode(".png", np.full((30, 40, 3), 255, dtype=np.uint8))
+        assert ok
+        return encoded.tobytes()
+
+    def quit(self):
+        self.quit_calls += 1
+
+
+def test_collect_with_driver_factory(tmp_path, monkeypatch):
+    monkeypatch.setattr(selenium_collector, "webdriver", object())
+    monkeypatch.setattr(selenium_collector, "Axe", None)
+    driver = FakeDriver()
+    collector = SeleniumCollector(driver_factory=lambda: driver)
+
+    artifacts = collector.collect("https://example.com", output_dir=tmp_path)
+
+    assert driver.visited == ["https://example.com"]
+    assert driver.quit_calls == 1
+    assert artifacts.visible_text == "Hello"
+    assert artifacts.dom_path.read_text(encoding="utf-8").startswith("<html>")
+    assert artifacts.screenshot.image.shape[:2] == (30, 40)
+
+
+def test_collect_returns_driver_to_pool(tmp_path, monkeypatch):
+    monkeypatch.setattr(selenium_collector, "webdriver", object())
+    monkeypatch.setattr(selenium_collector, "Axe", None)
+    drivers = []
+
+    def factory():
+        drivers.append(FakeDriver())
+        return drivers[-1]
+
+    with DriverPool(factory) as pool:
+        collector = SeleniumCollector(driver_pool=pool)
+        collector.collect("https://example.com/a", output_dir=tmp_path / "a")
+        collector.collect("https://example.com/b", output_dir=tmp_path / "b")
+        assert len(drivers) == 1
+        assert drivers[0].quit_calls == 0
+    assert drivers[0].quit_calls == 1
+
+
+def test_discard_wakes_waiting_acquire():
+    drivers = []
+
+    def factory():
+        drivers.append(FakeDriver())
+        return drivers[-1]
+
+    pool = DriverPool(factory, max_workers=1)
+    first = pool.acquire()
+    acquired = []
+    waiter = threading.Thread(target=lambda: acquired.append(pool.acquire()))
+    waiter.start()
+    pool.discard(first)
+    waiter.join(timeout=5)
+
+    assert not waiter.is_alive()
+    assert first.quit_calls == 1
+    assert acquired and acquired[0] is drivers[1]
+    pool.close()
+
+
+def test_failed_driver_lookup_is_retried(tmp_path, monkeypatch):
+    resolve = selenium_collector._resolve_chromedriver_path
+    monkeypatch.setattr(selenium_collector.shutil, "which", lambda name: None)
+    monkeypatch.setattr(selenium_collector, "ChromeDriverManager", None)
+    monkeypatch.setenv("CHROMEDRIVER_PATH", str(tmp_path / "chromedriver"))
+    resolve.cache_clear()
+
+    assert resolve() is None
+
+    driver_path = tmp_path / "chromedriver"
+    driver_path.write_text("", encoding="utf-8")
+    assert resolve() == str(driver_path)
+
+    driver_path.unlink()
+    assert resolve() == str(driver_path)
+    resolve.cache_clear()
+
+
+class CdpDriver(FakeDriver):
+    """Chromium-style driver that records DevTools commands."""
+
+    def __init__(self):
+        super().__init__()
+        self.cdp_calls = []
+
+    def execute_cdp_cmd(self, command, params):
+        self.cdp_calls.append((command, params))
+        return {}
+
+
+def test_release_clears_site_data_of_visited_origins():
+    driver = CdpDriver()
+    pool = DriverPool(lambda: driver)
+    assert pool.acquire() is driver
+    driver.get("https://www.example.com:8443/checkout?step=2")
+
+    pool.release(driver, visited=("https://example.com/cart", "https://example.com/other"))
+
+    cleared = {
+        params["origin"]
+        for command, params in driver.cdp_calls
+        if command == "Storage.clearDataForOrigin" and params["storageTypes"] == "all"
+    }
+    assert cleared == {"https://example.com", "https://www.example.com:8443"}
+    assert driver.visited[-1] == "about:blank"
+    assert ("Network.clearBrowserCookies", {}) in driver.cdp_calls
+    assert pool.acquire() is driver
+    pool.close()